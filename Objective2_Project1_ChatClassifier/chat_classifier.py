@@ -7,18 +7,67 @@ This program is a small NLP demo that:
 - Classifies a user message for INTENT (question, command, statement)
 
 It uses scikit-learn with a TF-IDF vectorizer and a linear model.
+Both classifiers share ONE vectorizer, so each message is tokenized
+and vectorized a single time and the same sparse matrix is fed to the
+sentiment head and the intent head.
 The training data is small but easy to extend, which shows how the
 system can evolve over time as I add more examples.
+
+Fitted models are saved to models/ together with a fingerprint of the
+training data, so later runs start instantly and only retrain when the
+examples change. The linear models can also be exported as plain NumPy
+arrays plus a vocabulary file for a lightweight inference path.
+
+There is also an ONLINE mode: a HashingVectorizer (no vocabulary to refit)
+feeds two SGDClassifier heads that are updated with partial_fit() as new
+labeled feedback arrives, with periodic checkpoints written to models/.
 """
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.pipeline import Pipeline
+import argparse
+import csv
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import SGDClassifier
 from sklearn.svm import LinearSVC
 
+import numpy_inference
+from numpy_inference import ChatModels
+
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+MODEL_PATH = os.path.join(MODELS_DIR, "chat_models.joblib")
+NUMPY_EXPORT_DIR = os.path.join(MODELS_DIR, "numpy_export")
+ONLINE_CHECKPOINT_PATH = os.path.join(MODELS_DIR, "chat_online.joblib")
 
-def build_sentiment_classifier():
+# partial_fit() has to know every label up front.
+SENTIMENT_LABELS = ["negative", "neutral", "positive"]
+INTENT_LABELS = ["command", "question", "statement"]
+
+
+# Bumped whenever models are trained, loaded, or updated online. Result
+# caches compare against it to know when their stored answers are stale.
+_model_generation = 0
+
+
+def mark_models_changed():
+    """
+    Record that some model changed, invalidating every ClassificationCache.
     """
-    Build a simple sentiment classifier.
+    global _model_generation
+    _model_generation += 1
+
+
+def get_sentiment_training_data():
+    """
+    Return the sentiment training texts and labels.
 
     Labels:
         - positive
@@ -78,18 +127,12 @@ def build_sentiment_classifier():
         "neutral", "neutral", "neutral", "neutral", "neutral",
     ]
 
-    model = Pipeline([
-        ("tfidf", TfidfVectorizer()),
-        ("clf", LinearSVC())
-    ])
-
-    model.fit(training_texts, training_labels)
-    return model
+    return training_texts, training_labels
 
 
-def build_intent_classifier():
+def get_intent_training_data():
     """
-    Build a simple intent classifier.
+    Return the intent training texts and labels.
 
     Labels:
         - question  (user is asking something)
@@ -146,25 +189,508 @@ def build_intent_classifier():
         "statement", "statement", "statement", "statement", "statement",
     ]
 
-    model = Pipeline([
-        ("tfidf", TfidfVectorizer()),
-        ("clf", LinearSVC())
-    ])
+    return training_texts, training_labels
 
-    model.fit(training_texts, training_labels)
+
+def build_shared_vectorizer():
+    """
+    Fit one TF-IDF vectorizer on the sentiment AND intent training texts.
+
+    Sharing the vocabulary means a message only has to be vectorized once,
+    no matter how many classifier heads read the result.
+    """
+    sentiment_texts, _ = get_sentiment_training_data()
+    intent_texts, _ = get_intent_training_data()
+
+    vectorizer = TfidfVectorizer()
+    vectorizer.fit(sentiment_texts + intent_texts)
+    return vectorizer
+
+
+def build_sentiment_classifier(vectorizer):
+    """
+    Build a simple sentiment classifier on top of the shared vectorizer.
+    """
+    training_texts, training_labels = get_sentiment_training_data()
+
+    model = LinearSVC()
+    model.fit(vectorizer.transform(training_texts), training_labels)
+    return model
+
+
+def build_intent_classifier(vectorizer):
+    """
+    Build a simple intent classifier on top of the shared vectorizer.
+    """
+    training_texts, training_labels = get_intent_training_data()
+
+    model = LinearSVC()
+    model.fit(vectorizer.transform(training_texts), training_labels)
     return model
 
 
-def classify_message(text, sentiment_model, intent_model):
+def build_models():
+    """
+    Fit the shared vectorizer and both classifier heads.
+    """
+    vectorizer = build_shared_vectorizer()
+    mark_models_changed()
+    return ChatModels(
+        vectorizer=vectorizer,
+        sentiment=build_sentiment_classifier(vectorizer),
+        intent=build_intent_classifier(vectorizer),
+    )
+
+
+def classify_batch(texts, models, cache=None):
+    """
+    Classify many messages at once.
+
+    The texts are vectorized a single time and the resulting sparse matrix
+    is passed to both heads. Returns a list of (sentiment, intent) pairs.
+    When a ClassificationCache is given, only the cache misses reach the
+    models.
+    """
+    if cache is not None:
+        return cache.classify_batch(texts, models)
+
+    X = models.vectorizer.transform(texts)
+    sentiments = models.sentiment.predict(X)
+    intents = models.intent.predict(X)
+    return [(str(s), str(i)) for s, i in zip(sentiments, intents)]
+
+
+def classify_message(text, models, cache=None):
     """
     Run both classifiers on the given text and return their predictions.
     """
-    sentiment = sentiment_model.predict([text])[0]
-    intent = intent_model.predict([text])[0]
-    return sentiment, intent
+    return classify_batch([text], models, cache=cache)[0]
+
+
+def normalize_message(text):
+    """
+    Cache key for a message: lowercase with whitespace collapsed.
+
+    Both vectorizers lowercase and split on whitespace anyway, so messages
+    with the same key always get the same prediction.
+    """
+    return " ".join(text.lower().split())
+
+
+class ClassificationCache:
+    """
+    Bounded LRU cache of (sentiment, intent) results keyed on the
+    normalized message text.
+
+    Chat traffic repeats itself a lot ("ok", "thanks", ...), so most
+    messages can skip vectorizing and scoring entirely. The cache empties
+    itself when it is used with different models or after any model has
+    been retrained or updated (see mark_models_changed()).
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._owner = None
+        self._lock = threading.Lock()
+
+    def _check_models(self, models):
+        owner = (id(models), _model_generation)
+        if owner != self._owner:
+            self.entries.clear()
+            self._owner = owner
+
+    def classify_batch(self, texts, models):
+        keys = [normalize_message(text) for text in texts]
+        results = [None] * len(texts)
+        missing = OrderedDict()  # key -> positions still needing a result
+
+        with self._lock:
+            self._check_models(models)
+            for pos, key in enumerate(keys):
+                cached = self.entries.get(key)
+                if cached is not None:
+                    self.entries.move_to_end(key)
+                    results[pos] = cached
+                    self.hits += 1
+                elif key in missing:
+                    # Repeat of a miss earlier in this batch: scored once and
+                    # shared, so it counts as a hit.
+                    missing[key].append(pos)
+                    self.hits += 1
+                else:
+                    missing[key] = [pos]
+                    self.misses += 1
+
+        if missing:
+            # Each distinct miss is scored once, even if it repeats in the batch.
+            fresh = classify_batch(list(missing), models)
+            with self._lock:
+                for (key, positions), result in zip(missing.items(), fresh):
+                    for pos in positions:
+                        results[pos] = result
+                    self.entries[key] = result
+                    self.entries.move_to_end(key)
+                    if len(self.entries) > self.max_size:
+                        self.entries.popitem(last=False)
+                        self.evictions += 1
+
+        return results
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def training_data_fingerprint(with_sklearn=True):
+    """
+    Hash the training examples (and the scikit-learn version).
+
+    Any edit to the training lists changes the fingerprint, which is how a
+    saved model knows it is stale and needs to be retrained. The NumPy
+    export leaves the scikit-learn version out: its arrays do not depend on
+    it, and numpy_inference.py runs without scikit-learn installed.
+    """
+    payload = {
+        "sentiment": get_sentiment_training_data(),
+        "intent": get_intent_training_data(),
+    }
+    if with_sklearn:
+        payload["sklearn"] = sklearn.__version__
+    raw = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def save_models(models, path=MODEL_PATH):
+    """
+    Save the fitted models along with the current training data fingerprint.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    # Store a plain dict so the file loads no matter which script saved it.
+    joblib.dump({
+        "fingerprint": training_data_fingerprint(),
+        "vectorizer": models.vectorizer,
+        "sentiment": models.sentiment,
+        "intent": models.intent,
+    }, tmp_path)
+    # Replace in one step so an interrupted save never leaves a truncated model.
+    os.replace(tmp_path, path)
+
+
+def load_models(path=MODEL_PATH):
+    """
+    Load saved models, or return None if they are missing or stale.
+    """
+    if not os.path.exists(path):
+        return None
+
+    saved = joblib.load(path)
+    if saved.get("fingerprint") != training_data_fingerprint():
+        return None
+
+    mark_models_changed()
+    return ChatModels(
+        vectorizer=saved["vectorizer"],
+        sentiment=saved["sentiment"],
+        intent=saved["intent"],
+    )
+
+
+def load_or_build_models(path=MODEL_PATH, retrain=False):
+    """
+    Use the saved models when they match the training data, otherwise
+    retrain and save them for next time.
+    """
+    models = None if retrain else load_models(path)
+    if models is not None:
+        print(f"Loaded saved models from {path}")
+        return models
+
+    print("Training models (no up-to-date saved copy found)...")
+    models = build_models()
+    save_models(models, path)
+    print(f"Saved models to {path}")
+    return models
+
+
+def export_numpy_models(models, out_dir=NUMPY_EXPORT_DIR):
+    """
+    Export the linear models as plain NumPy arrays plus a vocabulary file.
+
+    Files written:
+        - weights.npz      idf vector, coef/intercept/classes for each head
+        - vocabulary.json  term -> column index, tokenizer settings, fingerprint
+
+    Loading these only needs NumPy (numpy_inference.py), so the inference
+    path skips importing and unpickling scikit-learn objects.
+    """
+    vectorizer = models.vectorizer
+    os.makedirs(out_dir, exist_ok=True)
+
+    np.savez(
+        os.path.join(out_dir, "weights.npz"),
+        idf=vectorizer.idf_.astype(np.float64),
+        sentiment_coef=models.sentiment.coef_,
+        sentiment_intercept=models.sentiment.intercept_,
+        sentiment_classes=models.sentiment.classes_.astype(str),
+        intent_coef=models.intent.coef_,
+        intent_intercept=models.intent.intercept_,
+        intent_classes=models.intent.classes_.astype(str),
+    )
+
+    meta = {
+        "fingerprint": training_data_fingerprint(with_sklearn=False),
+        "token_pattern": vectorizer.token_pattern,
+        "lowercase": vectorizer.lowercase,
+        "vocabulary": {term: int(col) for term, col in vectorizer.vocabulary_.items()},
+    }
+    with open(os.path.join(out_dir, "vocabulary.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def load_numpy_models(out_dir=NUMPY_EXPORT_DIR):
+    """
+    Load an export written by export_numpy_models() (see numpy_inference.py).
+
+    Returns a ChatModels tuple that works with classify_batch(), or None if
+    the export is missing or was built from different training data.
+    """
+    models = numpy_inference.load_numpy_models(out_dir, training_data_fingerprint(with_sklearn=False))
+    if models is not None:
+        mark_models_changed()
+    return models
+
+
+def build_online_models(seed_epochs=20):
+    """
+    Build the incremental models and warm them up on the starter examples.
+
+    A HashingVectorizer needs no fitted vocabulary, so new words in later
+    feedback just land in their hashed column instead of forcing a refit.
+    """
+    vectorizer = HashingVectorizer(n_features=2 ** 18, alternate_sign=False)
+    models = ChatModels(
+        vectorizer=vectorizer,
+        sentiment=SGDClassifier(loss="hinge", random_state=42),
+        intent=SGDClassifier(loss="hinge", random_state=42),
+    )
+
+    sentiment_texts, sentiment_labels = get_sentiment_training_data()
+    intent_texts, intent_labels = get_intent_training_data()
+    X_sentiment = vectorizer.transform(sentiment_texts)
+    X_intent = vectorizer.transform(intent_texts)
+
+    # The starter set is tiny, so a few passes over it are cheap.
+    rng = np.random.default_rng(42)
+    for _ in range(seed_epochs):
+        order = rng.permutation(len(sentiment_labels))
+        models.sentiment.partial_fit(
+            X_sentiment[order], np.asarray(sentiment_labels)[order], classes=SENTIMENT_LABELS
+        )
+        order = rng.permutation(len(intent_labels))
+        models.intent.partial_fit(
+            X_intent[order], np.asarray(intent_labels)[order], classes=INTENT_LABELS
+        )
+
+    mark_models_changed()
+    return models
+
+
+def update_online_models(models, batch):
+    """
+    Update both online heads with one mini-batch of labeled feedback.
+
+    batch is a list of (text, sentiment, intent) tuples. Either label may be
+    empty when the feedback only covers one of the two tasks. The texts are
+    hashed once and each head trains on the rows that carry its label.
+    """
+    if not batch:
+        return
+
+    X = models.vectorizer.transform([text for text, _, _ in batch])
+
+    for head, column, labels in (
+        (models.sentiment, 1, SENTIMENT_LABELS),
+        (models.intent, 2, INTENT_LABELS),
+    ):
+        rows = [i for i, item in enumerate(batch) if item[column]]
+        if rows:
+            y = [batch[i][column] for i in rows]
+            head.partial_fit(X[rows], y, classes=labels)
+
+    mark_models_changed()
+
+
+def read_feedback_batches(path, batch_size=256):
+    """
+    Stream labeled feedback from a CSV file in mini-batches.
+
+    The CSV needs a 'text' column plus 'sentiment' and/or 'intent' columns.
+    Rows whose label is not one of the known labels are skipped.
+    """
+    batch = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            text = (row.get("text") or "").strip()
+            sentiment = (row.get("sentiment") or "").strip().lower()
+            intent = (row.get("intent") or "").strip().lower()
+
+            if sentiment not in SENTIMENT_LABELS:
+                sentiment = ""
+            if intent not in INTENT_LABELS:
+                intent = ""
+            if not text or not (sentiment or intent):
+                continue
+
+            batch.append((text, sentiment, intent))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def save_online_checkpoint(models, examples_seen, path=ONLINE_CHECKPOINT_PATH):
+    """
+    Write the online models to disk. The vectorizer is stateless, so only its
+    settings travel along with the two SGD heads.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    joblib.dump({
+        "vectorizer": models.vectorizer,
+        "sentiment": models.sentiment,
+        "intent": models.intent,
+        "examples_seen": examples_seen,
+    }, tmp_path)
+    # Replace in one step so a crash mid-write never leaves a broken checkpoint.
+    os.replace(tmp_path, path)
+
+
+def load_online_checkpoint(path=ONLINE_CHECKPOINT_PATH):
+    """
+    Load the latest online checkpoint.
+
+    Returns (models, examples_seen), or (None, 0) when no checkpoint exists.
+    """
+    if not os.path.exists(path):
+        return None, 0
+
+    saved = joblib.load(path)
+    models = ChatModels(
+        vectorizer=saved["vectorizer"],
+        sentiment=saved["sentiment"],
+        intent=saved["intent"],
+    )
+    mark_models_changed()
+    return models, saved["examples_seen"]
+
+
+def load_or_build_online_models(path=ONLINE_CHECKPOINT_PATH):
+    """
+    Resume from the online checkpoint, or start fresh from the starter set.
+    """
+    models, examples_seen = load_online_checkpoint(path)
+    if models is None:
+        models = build_online_models()
+    return models, examples_seen
+
+
+def learn_from_feedback(feedback_path, batch_size=256, checkpoint_every=20,
+                        checkpoint_path=ONLINE_CHECKPOINT_PATH):
+    """
+    Ingest a feedback file into the online models.
+
+    Work is proportional to the new feedback only: the models resume from
+    the last checkpoint and are never refit on old data. A checkpoint is
+    written every `checkpoint_every` mini-batches and once more at the end.
+    """
+    models, examples_seen = load_or_build_online_models(checkpoint_path)
+
+    batches = 0
+    for batch in read_feedback_batches(feedback_path, batch_size=batch_size):
+        update_online_models(models, batch)
+        examples_seen += len(batch)
+        batches += 1
+        if batches % checkpoint_every == 0:
+            save_online_checkpoint(models, examples_seen, checkpoint_path)
+
+    save_online_checkpoint(models, examples_seen, checkpoint_path)
+    return models, examples_seen
+
+
+def select_models(numpy=False, online=False, retrain=False):
+    """
+    Pick which set of models to classify with:
+        - numpy:  the exported NumPy arrays (exported first if needed)
+        - online: the incrementally trained SGD models
+        - default: the saved TF-IDF + LinearSVC models
+    """
+    if numpy:
+        models = load_numpy_models()
+        if models is None:
+            export_numpy_models(load_or_build_models(retrain=retrain))
+            models = load_numpy_models()
+        print(f"Using NumPy models from {NUMPY_EXPORT_DIR}")
+        return models
+
+    if online:
+        models, examples_seen = load_or_build_online_models()
+        print(f"Using online models ({examples_seen} feedback examples learned)")
+        return models
+
+    return load_or_build_models(retrain=retrain)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Objective 2 - Project 1: Chat Classifier")
+    parser.add_argument("--retrain", action="store_true",
+                        help="ignore any saved models and train from scratch")
+    parser.add_argument("--export-numpy", action="store_true",
+                        help="export the linear models as NumPy arrays and exit")
+    parser.add_argument("--numpy", action="store_true",
+                        help="classify with the exported NumPy models")
+    parser.add_argument("--online", action="store_true",
+                        help="classify with the incrementally trained online models")
+    parser.add_argument("--learn", metavar="FEEDBACK_CSV",
+                        help="update the online models from a feedback CSV and exit")
+    parser.add_argument("--batch-size", type=int, default=256,
+                        help="mini-batch size used by --learn (default: 256)")
+    parser.add_argument("--cache-size", type=int, default=10000,
+                        help="LRU result cache size, 0 to disable (default: 10000)")
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+
+    if args.export_numpy:
+        models = load_or_build_models(retrain=args.retrain)
+        export_numpy_models(models)
+        print(f"Exported NumPy models to {NUMPY_EXPORT_DIR}")
+        return
+
+    if args.learn:
+        _, examples_seen = learn_from_feedback(args.learn, batch_size=args.batch_size)
+        print(f"Online models updated. Total feedback examples seen: {examples_seen}")
+        print(f"Checkpoint saved to {ONLINE_CHECKPOINT_PATH}")
+        return
+
     print("=" * 60)
     print("Objective 2 - Project 1: Chat Classifier")
     print("Create and evolve natural language processing systems.")
@@ -177,13 +703,16 @@ def main():
     print("Type 'quit' or 'exit' to leave.")
     print()
 
-    # Build models once at startup
-    sentiment_model = build_sentiment_classifier()
-    intent_model = build_intent_classifier()
+    # Load (or build) models once at startup
+    models = select_models(numpy=args.numpy, online=args.online, retrain=args.retrain)
+    cache = ClassificationCache(args.cache_size) if args.cache_size > 0 else None
+    print()
 
     while True:
         user_input = input("You: ").strip()
         if user_input.lower() in ("quit", "exit"):
+            if cache is not None:
+                print(f"Result cache: {cache.stats()}")
             print("Goodbye! Thanks for testing the chat classifier.")
             break
 
@@ -191,14 +720,14 @@ def main():
             print("Please type something for me to classify.")
             continue
 
-        sentiment, intent = classify_message(user_input, sentiment_model, intent_model)
+        sentiment, intent = classify_message(user_input, models, cache=cache)
 
         print(f"  -> Sentiment: {sentiment}")
         print(f"  -> Intent:    {intent}")
         print("-" * 60)
         print("Hint: To 'evolve' this system over time, you can add more")
-        print("training examples in the build_sentiment_classifier() and")
-        print("build_intent_classifier() functions and re-run the program.")
+        print("training examples in the get_sentiment_training_data() and")
+        print("get_intent_training_data() functions and re-run the program.")
         print("-" * 60)
 
 
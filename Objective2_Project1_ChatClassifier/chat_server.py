@@ -0,0 +1,319 @@
+"""
+Objective 2 - Project 1: Chat Classifier (server mode)
+
+Serves the chat classifier over HTTP from a single process using only the
+Python standard library (asyncio).
+
+Endpoints:
+    POST /classify   {"text": "..."}  or  {"texts": ["...", "..."]}
+    GET  /stats      latency (p50/p99) and throughput numbers
+
+Requests that arrive close together are collected into MICRO-BATCHES:
+the server waits a tiny window (2 ms by default) or until 256 messages are
+queued, then vectorizes the whole batch once and runs it through the
+sentiment and intent models together. Repeated messages are answered
+from an LRU result cache before they ever reach the models.
+
+How to run:
+    python chat_server.py --port 8000
+    curl -X POST localhost:8000/classify -d '{"text": "Run the test again"}'
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+from chat_classifier import ClassificationCache, classify_batch, select_models
+
+
+class MicroBatcher:
+    """
+    Collect concurrent classify requests and run them as one batch.
+
+    Each queued item is (texts, future). A batch is closed when the window
+    expires or when the next request would push it past max_batch messages,
+    whichever comes first. Requests larger than max_batch are split, so no
+    batch ever holds more than max_batch messages.
+    """
+
+    def __init__(self, models, window_ms=2.0, max_batch=256, cache=None):
+        self.models = models
+        self.cache = cache
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue()
+        self.batches = 0
+
+    async def classify(self, texts):
+        if len(texts) > self.max_batch:
+            parts = await asyncio.gather(*(
+                self.classify(texts[start:start + self.max_batch])
+                for start in range(0, len(texts), self.max_batch)
+            ))
+            return [result for part in parts for result in part]
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((texts, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        carry = None  # a request that did not fit in the previous batch
+        while True:
+            items = [carry if carry is not None else await self.queue.get()]
+            carry = None
+            size = len(items[0][0])
+
+            # Give other requests a moment to join this batch.
+            if size < self.max_batch and self.queue.empty():
+                await asyncio.sleep(self.window)
+
+            while size < self.max_batch and not self.queue.empty():
+                item = self.queue.get_nowait()
+                if size + len(item[0]) > self.max_batch:
+                    carry = item  # starts the next batch
+                    break
+                items.append(item)
+                size += len(item[0])
+
+            texts = [text for item_texts, _ in items for text in item_texts]
+            try:
+                # Run the models off the event loop so new requests keep
+                # queuing up while this batch is being scored.
+                results = await loop.run_in_executor(
+                    None, classify_batch, texts, self.models, self.cache
+                )
+            except Exception as exc:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            self.batches += 1
+            start = 0
+            for item_texts, future in items:
+                end = start + len(item_texts)
+                if not future.done():
+                    future.set_result(results[start:end])
+                start = end
+
+
+class ServerStats:
+    """
+    Track request latency and message throughput.
+
+    Only the most recent latencies are kept, so memory stays fixed no
+    matter how long the server runs.
+    """
+
+    def __init__(self, window=10000):
+        self.latencies_ms = deque(maxlen=window)
+        self.requests = 0
+        self.messages = 0
+        self.started = time.perf_counter()
+
+    def record(self, latency_ms, messages):
+        self.latencies_ms.append(latency_ms)
+        self.requests += 1
+        self.messages += messages
+
+    def summary(self, batches=0, cache=None):
+        elapsed = time.perf_counter() - self.started
+        if self.latencies_ms:
+            p50, p99 = np.percentile(np.fromiter(self.latencies_ms, dtype=float), [50, 99])
+        else:
+            p50 = p99 = 0.0
+        summary = {
+            "requests": self.requests,
+            "messages": self.messages,
+            "batches": batches,
+            "avg_batch_size": round(self.messages / batches, 2) if batches else 0.0,
+            "p50_ms": round(float(p50), 3),
+            "p99_ms": round(float(p99), 3),
+            "throughput_msgs_per_s": round(self.messages / elapsed, 1) if elapsed > 0 else 0.0,
+            "uptime_s": round(elapsed, 1),
+        }
+        if cache is not None:
+            summary["cache"] = cache.stats()
+        return summary
+
+
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+async def write_json(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    ).encode("ascii")
+    writer.write(head + body)
+    await writer.drain()
+
+
+def parse_texts(body):
+    """
+    Pull the message list out of a /classify request body.
+    Returns (texts, single) or raises ValueError.
+    """
+    data = json.loads(body or b"{}")
+    if isinstance(data, dict) and isinstance(data.get("text"), str):
+        return [data["text"]], True
+    if isinstance(data, dict) and isinstance(data.get("texts"), list):
+        if all(isinstance(t, str) for t in data["texts"]):
+            return data["texts"], False
+    raise ValueError('expected {"text": "..."} or {"texts": ["...", ...]}')
+
+
+async def handle_request(method, path, body, batcher, stats):
+    """
+    Route one HTTP request. Returns (status, payload).
+    """
+    if path == "/stats":
+        if method != "GET":
+            return 405, {"error": "use GET /stats"}
+        return 200, stats.summary(batcher.batches, batcher.cache)
+
+    if path != "/classify":
+        return 404, {"error": f"unknown path {path}"}
+    if method != "POST":
+        return 405, {"error": "use POST /classify"}
+
+    try:
+        texts, single = parse_texts(body)
+    except ValueError as exc:
+        return 400, {"error": str(exc)}
+
+    start = time.perf_counter()
+    results = await batcher.classify(texts) if texts else []
+    stats.record((time.perf_counter() - start) * 1000.0, len(texts))
+
+    labeled = [{"sentiment": s, "intent": i} for s, i in results]
+    if single:
+        return 200, labeled[0]
+    return 200, {"results": labeled}
+
+
+async def handle_client(reader, writer, batcher, stats):
+    """
+    Serve HTTP/1.1 requests on one connection until the client closes it.
+    """
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) < 2:
+                await write_json(writer, 400, {"error": "bad request line"}, keep_alive=False)
+                break
+            method, path = parts[0].upper(), parts[1].split("?", 1)[0]
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", "0") or 0)
+            body = await reader.readexactly(length) if length else b""
+            keep_alive = headers.get("connection", "").lower() != "close"
+
+            try:
+                status, payload = await handle_request(method, path, body, batcher, stats)
+            except Exception as exc:
+                status, payload = 500, {"error": str(exc)}
+
+            await write_json(writer, status, payload, keep_alive)
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def report_stats(batcher, stats, every_s):
+    while True:
+        await asyncio.sleep(every_s)
+        print("[stats]", json.dumps(stats.summary(batcher.batches, batcher.cache)))
+
+
+async def serve(models, host="127.0.0.1", port=8000, window_ms=2.0, max_batch=256,
+                report_every=0, cache_size=10000):
+    cache = ClassificationCache(cache_size) if cache_size > 0 else None
+    batcher = MicroBatcher(models, window_ms=window_ms, max_batch=max_batch, cache=cache)
+    stats = ServerStats()
+
+    server = await asyncio.start_server(
+        lambda r, w: handle_client(r, w, batcher, stats), host, port
+    )
+    tasks = [asyncio.create_task(batcher.run())]
+    if report_every > 0:
+        tasks.append(asyncio.create_task(report_stats(batcher, stats, report_every)))
+
+    print(f"Chat classifier server listening on http://{host}:{port}")
+    print(f"Micro-batching: window={window_ms} ms, max batch={max_batch} messages")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve the chat classifier over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--window-ms", type=float, default=2.0,
+                        help="how long to wait for more requests to join a batch (default: 2)")
+    parser.add_argument("--max-batch", type=int, default=256,
+                        help="maximum messages per batch (default: 256)")
+    parser.add_argument("--report-every", type=float, default=10.0,
+                        help="print stats every N seconds, 0 to disable (default: 10)")
+    parser.add_argument("--cache-size", type=int, default=10000,
+                        help="LRU result cache size, 0 to disable (default: 10000)")
+    parser.add_argument("--numpy", action="store_true",
+                        help="serve the exported NumPy models")
+    parser.add_argument("--online", action="store_true",
+                        help="serve the incrementally trained online models")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    models = select_models(numpy=args.numpy, online=args.online)
+
+    try:
+        asyncio.run(serve(
+            models,
+            host=args.host,
+            port=args.port,
+            window_ms=args.window_ms,
+            max_batch=args.max_batch,
+            report_every=args.report_every,
+            cache_size=args.cache_size,
+        ))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+
+if __name__ == "__main__":
+    main()
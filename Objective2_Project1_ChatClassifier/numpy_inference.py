@@ -0,0 +1,131 @@
+"""
+Objective 2 - Project 1: Chat Classifier (NumPy-only inference)
+
+Loads the arrays written by `chat_classifier.py --export-numpy` and
+classifies messages with them. This module imports only NumPy and the
+standard library, so a service that just serves predictions does not
+need scikit-learn installed (or the time it takes to import it).
+
+    from numpy_inference import load_numpy_models, classify_batch
+    models = load_numpy_models("models/numpy_export")
+    classify_batch(["can you help me?"], models)
+"""
+
+import json
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+
+
+# Everything needed at inference time: the shared vectorizer plus the
+# two linear heads that read its output.
+ChatModels = namedtuple("ChatModels", ["vectorizer", "sentiment", "intent"])
+
+
+class NumpyTfidfVectorizer:
+    """
+    NumPy-only stand-in for the fitted TfidfVectorizer.
+
+    transform() returns one (columns, values) pair per text instead of a
+    SciPy sparse matrix, which is all the linear heads need.
+    """
+
+    def __init__(self, vocabulary, idf, token_pattern, lowercase=True):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.token_re = re.compile(token_pattern)
+        self.lowercase = lowercase
+
+    def transform(self, texts):
+        rows = []
+        for text in texts:
+            if self.lowercase:
+                text = text.lower()
+
+            counts = {}
+            for token in self.token_re.findall(text):
+                col = self.vocabulary.get(token)
+                if col is not None:
+                    counts[col] = counts.get(col, 0) + 1
+
+            cols = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+            values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+            values *= self.idf[cols]
+
+            # Same l2 normalization TfidfVectorizer applies by default.
+            norm = np.sqrt(np.dot(values, values))
+            if norm > 0:
+                values /= norm
+            rows.append((cols, values))
+        return rows
+
+
+class NumpyLinearHead:
+    """
+    NumPy-only stand-in for a fitted LinearSVC.
+    """
+
+    def __init__(self, coef, intercept, classes):
+        self.coef = coef
+        self.intercept = intercept
+        self.classes = classes
+
+    def predict(self, rows):
+        labels = []
+        for cols, values in rows:
+            scores = self.coef[:, cols] @ values + self.intercept
+            if len(scores) == 1:
+                # Binary LinearSVC keeps a single row of weights.
+                labels.append(self.classes[int(scores[0] > 0)])
+            else:
+                labels.append(self.classes[int(np.argmax(scores))])
+        return labels
+
+
+def load_numpy_models(out_dir, fingerprint=None):
+    """
+    Load an export written by chat_classifier.export_numpy_models().
+
+    Returns a ChatModels tuple, or None if the export is missing. When a
+    training data `fingerprint` is given, an export built from different
+    data also returns None.
+    """
+    meta_path = os.path.join(out_dir, "vocabulary.json")
+    weights_path = os.path.join(out_dir, "weights.npz")
+    if not (os.path.exists(meta_path) and os.path.exists(weights_path)):
+        return None
+
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if fingerprint is not None and meta.get("fingerprint") != fingerprint:
+        return None
+
+    weights = np.load(weights_path)
+    vectorizer = NumpyTfidfVectorizer(
+        vocabulary=meta["vocabulary"],
+        idf=weights["idf"],
+        token_pattern=meta["token_pattern"],
+        lowercase=meta["lowercase"],
+    )
+    return ChatModels(
+        vectorizer=vectorizer,
+        sentiment=NumpyLinearHead(
+            weights["sentiment_coef"], weights["sentiment_intercept"], weights["sentiment_classes"]
+        ),
+        intent=NumpyLinearHead(
+            weights["intent_coef"], weights["intent_intercept"], weights["intent_classes"]
+        ),
+    )
+
+
+def classify_batch(texts, models):
+    """
+    Classify many messages with NumPy models. Returns a list of
+    (sentiment, intent) pairs, like chat_classifier.classify_batch().
+    """
+    rows = models.vectorizer.transform(texts)
+    sentiments = models.sentiment.predict(rows)
+    intents = models.intent.predict(rows)
+    return [(str(s), str(i)) for s, i in zip(sentiments, intents)]
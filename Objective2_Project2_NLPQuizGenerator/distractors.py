@@ -0,0 +1,154 @@
+"""
+Objective 2 - Project 2: NLP Quiz Generator (multiple-choice distractors)
+
+Turns fill-in-the-blank questions into 4-option multiple-choice questions.
+The wrong answers (distractors) are the words most SIMILAR to the correct
+keyword, so they are plausible rather than random.
+
+Similarity comes from co-occurrence:
+1. Build a sparse sentence x word matrix (1 if the word is in the sentence).
+2. Multiply it by its transpose to get a word x word co-occurrence matrix.
+3. Two words are similar when their co-occurrence rows point the same way
+   (cosine similarity), i.e. they tend to appear next to the same words.
+
+All keywords are scored at once with one sparse matrix product per chunk,
+and the top-k neighbors are picked with np.argpartition, so thousands of
+keywords take seconds.
+"""
+
+import random
+from itertools import chain
+
+import numpy as np
+from scipy import sparse
+
+from quiz_generator import STOPWORDS, split_sentences, tokenize_words
+
+
+def build_cooccurrence(sentences, min_length=4):
+    """
+    Build the word co-occurrence model for a list of sentences.
+
+    Returns (vocab, word_index, vectors, frequencies) where vectors is a
+    CSR matrix with one l2-normalized co-occurrence row per word.
+    """
+    word_index = {}
+    rows, cols = [], []
+    for sent_id, sentence in enumerate(sentences):
+        for token in set(tokenize_words(sentence)):
+            if token in STOPWORDS or len(token) < min_length:
+                continue
+            col = word_index.setdefault(token, len(word_index))
+            rows.append(sent_id)
+            cols.append(col)
+
+    vocab = list(word_index)
+    X = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+        shape=(len(sentences), len(vocab)),
+    )
+
+    # Word x word counts of how often two words share a sentence.
+    cooc = (X.T @ X).tocsr()
+    frequencies = np.asarray(cooc.diagonal()).ravel()
+    cooc.setdiag(0)
+    cooc.eliminate_zeros()
+
+    norms = np.sqrt(np.asarray(cooc.multiply(cooc).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    vectors = sparse.diags(1.0 / norms).dot(cooc).tocsr()
+    return vocab, word_index, vectors, frequencies
+
+
+def nearest_neighbors(words, word_index, vectors, k=3, chunk_size=512):
+    """
+    Return the k most similar vocabulary ids for each word (-1 padding when
+    the word is unknown). Words are processed in chunks so the dense score
+    block stays small even for a large vocabulary.
+    """
+    result = np.full((len(words), k), -1, dtype=np.int64)
+    known = [(i, word_index[w]) for i, w in enumerate(words) if w in word_index]
+    if not known or vectors.shape[0] < 2:
+        return result
+
+    positions = np.array([i for i, _ in known])
+    ids = np.array([j for _, j in known])
+    k_eff = min(k, vectors.shape[0] - 1)
+
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        scores = (vectors[chunk] @ vectors.T).toarray()
+        scores[np.arange(len(chunk)), chunk] = -np.inf
+
+        top = np.argpartition(-scores, k_eff - 1, axis=1)[:, :k_eff]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        # Words that never share a neighbor are not real matches.
+        top[np.take_along_axis(top_scores, order, axis=1) <= 0] = -1
+        result[positions[start:start + chunk_size], :k_eff] = top
+
+    return result
+
+
+def create_multiple_choice_questions(sentences, fill_in_questions, num_options=4,
+                                     min_length=4, seed=42, model=None):
+    """
+    Add answer options to fill-in-the-blank questions.
+
+    Each result looks like:
+        {'keyword': 'energy', 'question': 'Solar _____ is clean',
+         'options': ['power', 'energy', 'grid', 'panels'], 'answer': 'B'}
+
+    `model` can be a prebuilt build_cooccurrence() result (for example over
+    a whole corpus); otherwise one is built from `sentences`.
+    """
+    if model is None:
+        model = build_cooccurrence(sentences, min_length=min_length)
+    vocab, word_index, vectors, frequencies = model
+
+    keywords = [q["keyword"].lower() for q in fill_in_questions]
+    # Ask for a few extra neighbors in case some have to be skipped below.
+    neighbors = nearest_neighbors(keywords, word_index, vectors, k=num_options + 5)
+    by_frequency = np.argsort(-frequencies, kind="stable")
+
+    rng = random.Random(seed)
+    questions = []
+    for q, keyword, row in zip(fill_in_questions, keywords, neighbors):
+        # A distractor should not already be visible in the question.
+        in_sentence = set(tokenize_words(q["question"]))
+
+        distractors = []
+        # Nearest neighbors first, then the most frequent words as backup.
+        for word_id in chain(row, by_frequency):
+            if len(distractors) == num_options - 1:
+                break
+            if word_id < 0:
+                continue
+            word = vocab[word_id]
+            if word != keyword and word not in in_sentence and word not in distractors:
+                distractors.append(word)
+
+        if len(distractors) < num_options - 1:
+            continue
+
+        options = distractors + [keyword]
+        rng.shuffle(options)
+        questions.append({
+            "keyword": q["keyword"],
+            "question": q["question"],
+            "options": options,
+            "answer": "ABCDEFGH"[options.index(keyword)],
+        })
+
+    return questions
+
+
+def build_cooccurrence_from_texts(texts, min_length=4):
+    """
+    Build one co-occurrence model over many passages (a whole corpus).
+    """
+    sentences = []
+    for text in texts:
+        sentences.extend(split_sentences(text))
+    return build_cooccurrence(sentences, min_length=min_length)
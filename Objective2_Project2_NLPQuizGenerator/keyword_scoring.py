@@ -0,0 +1,237 @@
+"""
+Objective 2 - Project 2: NLP Quiz Generator (corpus keyword scoring)
+
+Raw in-passage frequency lets common words like "people" or "things" win
+the keyword list. This module scores words with TF-IDF instead: a word is
+a good keyword when it is frequent in THIS passage but rare across a
+reference corpus of lessons.
+
+The corpus statistics live in a small document-frequency (DF) table that
+is built once and saved as plain NumPy files:
+
+    data-*/vocab.npy   sorted vocabulary (fixed-width unicode array)
+    data-*/df.npy      number of documents containing each vocabulary word
+    meta.json          {"num_docs": N, "data": "data-..."}
+
+Saving writes a new data-* folder and then replaces meta.json, so an
+update is published all at once.
+
+Both .npy files are memory-mapped on load, so opening even a large table
+is instant and worker processes share the same pages. Scoring a passage
+is a vectorized binary search (np.searchsorted) into the sorted vocabulary.
+New lessons can be folded into an existing table with `update`.
+
+How to run:
+    python keyword_scoring.py build lessons/ --table df_table
+    python keyword_scoring.py update new_lessons.jsonl --table df_table
+    python quiz_generator.py --df-table df_table
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from collections import Counter
+
+import numpy as np
+
+from quiz_generator import STOPWORDS, iter_passages, tokenize_words
+
+
+class DocumentFrequencyTable:
+    """
+    Sorted vocabulary + document counts for a reference corpus.
+    """
+
+    def __init__(self, vocab, df, num_docs):
+        self.vocab = vocab
+        self.df = df
+        self.num_docs = int(num_docs)
+
+    @classmethod
+    def empty(cls):
+        return cls(np.array([], dtype="<U1"), np.array([], dtype=np.int64), 0)
+
+    @classmethod
+    def load(cls, table_dir, mmap=True):
+        mode = "r" if mmap else None
+        with open(os.path.join(table_dir, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        data_dir = os.path.join(table_dir, meta["data"])
+        vocab = np.load(os.path.join(data_dir, "vocab.npy"), mmap_mode=mode)
+        df = np.load(os.path.join(data_dir, "df.npy"), mmap_mode=mode)
+        return cls(vocab, df, meta["num_docs"])
+
+    def save(self, table_dir):
+        """
+        Write the arrays into a fresh data folder, then publish it by
+        replacing meta.json in one os.replace().
+
+        Readers either see the old meta.json and old arrays or the new ones,
+        never a mix, and tables already memory-mapped keep their files. The
+        previous data folder is kept for readers that are between reading
+        meta.json and opening the arrays; older ones are removed.
+        """
+        os.makedirs(table_dir, exist_ok=True)
+        data_dir = tempfile.mkdtemp(prefix="data-", dir=table_dir)
+        os.chmod(data_dir, 0o755)  # mkdtemp makes it private to this user
+        data_name = os.path.basename(data_dir)
+        for name, array in (("vocab.npy", self.vocab), ("df.npy", self.df)):
+            with open(os.path.join(data_dir, name), "wb") as f:
+                np.save(f, np.asarray(array))
+
+        meta_path = os.path.join(table_dir, "meta.json")
+        previous = None
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                previous = json.load(f).get("data")
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"num_docs": self.num_docs, "data": data_name}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+        for name in os.listdir(table_dir):
+            if name.startswith("data-") and name not in (data_name, previous):
+                shutil.rmtree(os.path.join(table_dir, name), ignore_errors=True)
+
+    def lookup(self, words):
+        """
+        Document frequency for each word (0 for words not in the table).
+        """
+        words = np.asarray(words, dtype=str)
+        counts = np.zeros(len(words), dtype=np.int64)
+        if len(self.vocab) == 0 or len(words) == 0:
+            return counts
+
+        pos = np.searchsorted(self.vocab, words)
+        pos = np.minimum(pos, len(self.vocab) - 1)
+        found = self.vocab[pos] == words
+        counts[found] = self.df[pos[found]]
+        return counts
+
+    def idf(self, words):
+        """
+        Smoothed inverse document frequency: log((1 + N) / (1 + df)) + 1.
+        """
+        df = self.lookup(words)
+        return np.log((1.0 + self.num_docs) / (1.0 + df)) + 1.0
+
+    def update(self, documents):
+        """
+        Return a new table that also counts the given documents.
+
+        Only the new documents are tokenized; their counts are merged into
+        the existing sorted arrays.
+        """
+        new_counts = count_document_frequencies(documents)
+        num_new_docs = new_counts.pop(None, 0)
+        if not new_counts:
+            return DocumentFrequencyTable(np.asarray(self.vocab), np.asarray(self.df),
+                                          self.num_docs + num_new_docs)
+
+        new_vocab = np.array(sorted(new_counts), dtype=str)
+        new_df = np.array([new_counts[w] for w in new_vocab], dtype=np.int64)
+
+        merged_vocab = np.union1d(np.asarray(self.vocab), new_vocab)
+        merged_df = np.zeros(len(merged_vocab), dtype=np.int64)
+        if len(self.vocab):
+            merged_df[np.searchsorted(merged_vocab, self.vocab)] += self.df
+        merged_df[np.searchsorted(merged_vocab, new_vocab)] += new_df
+
+        return DocumentFrequencyTable(merged_vocab, merged_df, self.num_docs + num_new_docs)
+
+
+def count_document_frequencies(documents):
+    """
+    Count in how many documents each word appears.
+
+    The total number of documents is stored under the key None.
+    """
+    counts = Counter()
+    num_docs = 0
+    for text in documents:
+        counts.update(set(tokenize_words(text)))
+        num_docs += 1
+    counts[None] = num_docs
+    return counts
+
+
+def build_df_table(documents):
+    """
+    Build a fresh document-frequency table from an iterable of texts.
+    """
+    return DocumentFrequencyTable.empty().update(documents)
+
+
+def extract_keywords_tfidf(tokens, table, max_keywords=8, min_length=4):
+    """
+    Pick keywords by TF-IDF against a corpus DF table.
+
+    Same inputs and outputs as quiz_generator.extract_keywords(): returns
+    (keywords, counts) where counts holds the in-passage frequencies.
+    Ties keep the order in which the words first appear.
+    """
+    filtered = [
+        t for t in tokens
+        if t not in STOPWORDS and len(t) >= min_length
+    ]
+
+    counts = Counter(filtered)
+    return rank_keywords_tfidf(counts, table, max_keywords), counts
+
+
+def rank_keywords_tfidf(counts, table, max_keywords=8):
+    """
+    The `max_keywords` words of a {word: in-passage count} Counter with the
+    highest TF-IDF. Ties keep the Counter's (first appearance) order.
+    """
+    if not counts:
+        return []
+
+    words = list(counts)
+    tf = np.fromiter(counts.values(), dtype=np.float64, count=len(words))
+    scores = tf * table.idf(words)
+
+    order = np.argsort(-scores, kind="stable")[:max_keywords]
+    return [words[i] for i in order]
+
+
+def read_corpus_texts(source):
+    """
+    Yield the text of every passage in a folder of .txt files or a .jsonl file.
+    Records that are not valid JSON objects or have no string text are skipped.
+    """
+    for _, text, path, error in iter_passages(source):
+        if error is not None:
+            continue
+        if path is not None:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                text = f.read()
+        if isinstance(text, str):
+            yield text
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build or update a keyword DF table.")
+    parser.add_argument("command", choices=["build", "update"])
+    parser.add_argument("source", help="folder of .txt passages or a .jsonl file of {id, text} records")
+    parser.add_argument("--table", default="df_table",
+                        help="directory holding the DF table (default: df_table)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.command == "build":
+        table = build_df_table(read_corpus_texts(args.source))
+    else:
+        table = DocumentFrequencyTable.load(args.table, mmap=False)
+        table = table.update(read_corpus_texts(args.source))
+
+    table.save(args.table)
+    print(f"Saved DF table to {args.table}: {len(table.vocab)} words, {table.num_docs} documents")
+
+
+if __name__ == "__main__":
+    main()
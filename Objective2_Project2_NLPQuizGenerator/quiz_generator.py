@@ -12,13 +12,35 @@ a small quiz based on it. It does three main things:
 3. Prints some generic comprehension questions that a
    teacher or student can use to think about the passage.
 
+It can also run in BATCH mode over a whole folder of .txt lessons or a
+JSONL file of passages, generating every quiz in parallel worker
+processes and writing one JSON result per line:
+
+    python quiz_generator.py --batch lessons/ --out quizzes.jsonl
+
+With --df-table, keywords are ranked by TF-IDF against a reference corpus
+(see keyword_scoring.py) instead of raw frequency. --multiple-choice adds
+4-option questions whose wrong answers are the words most similar to the
+keyword (see distractors.py).
+
+For book-length input, --stream reads a file (or stdin) line by line and
+keeps only word counts plus a bounded pool of candidate sentences, so
+memory does not grow with the length of the text:
+
+    python quiz_generator.py --stream book.txt
+
 This shows an evolving natural language processing system:
 as I improve the keyword logic, stopwords, or question
 templates, the quality of the quiz gets better over time.
 """
 
+import argparse
+import json
+import os
 import re
+import sys
 from collections import Counter
+from multiprocessing import Pool
 from textwrap import fill
 
 
@@ -33,6 +55,21 @@ STOPWORDS = {
     "when", "where", "how", "what", "why", "who"
 }
 
+# Same word pattern everywhere, so keywords and sentence tokens line up.
+WORD_RE = re.compile(r"[A-Za-z']+")
+
+# Sentence boundary used by split_sentences() and the streaming reader.
+SENTENCE_END_RE = re.compile(r"[.!?]\s+")
+
+# Generic questions that work for any passage.
+COMPREHENSION_QUESTIONS = [
+    "In your own words, what is the main idea of this passage?",
+    "List two important details that support the main idea.",
+    "Why do you think this information is important or useful?",
+    "Is there anything in the passage that you found confusing? What is it?",
+    "How could you apply what you learned from this passage in real life?",
+]
+
 
 def read_passage_from_user():
     """
@@ -65,7 +102,7 @@ def tokenize_words(passage):
 
     Returns a list of lowercase tokens like: ['example', 'words', 'here'].
     """
-    tokens = re.findall(r"[A-Za-z']+", passage)
+    tokens = WORD_RE.findall(passage)
     tokens = [t.lower() for t in tokens]
     return tokens
 
@@ -77,7 +114,7 @@ def split_sentences(passage):
     This is not perfect, but good enough for this small project.
     """
     # Split on ., ?, or ! followed by whitespace
-    raw_sentences = re.split(r"[.!?]\s+", passage)
+    raw_sentences = SENTENCE_END_RE.split(passage)
     sentences = [s.strip() for s in raw_sentences if s.strip()]
     return sentences
 
@@ -101,44 +138,103 @@ def extract_keywords(tokens, max_keywords=8, min_length=4):
     return keywords, counts
 
 
-def create_fill_in_blank_questions(sentences, keywords, max_questions=5):
+def _is_word_char(char):
+    # What \w matches in a str pattern.
+    return char.isalnum() or char == "_"
+
+
+def _word_boundaries(sentence, start, end):
+    """
+    Positions in start..end where the regex \b would match.
+    """
+    bounds = []
+    for pos in range(start, end + 1):
+        before = pos > 0 and _is_word_char(sentence[pos - 1])
+        after = pos < len(sentence) and _is_word_char(sentence[pos])
+        if before != after:
+            bounds.append(pos)
+    return bounds
+
+
+def iter_blank_spans(sentence):
+    """
+    Yield (token, start, end) for every place a keyword could be blanked,
+    with the lowercase token at its FIRST position in the sentence.
+
+    These are exactly the places the original \bkeyword\b search could
+    match. That covers whole WORD_RE tokens, and also the parts of a token
+    that \b splits off: "energy" inside "energy's", or "don" inside
+    "don't". A token next to a digit or accented letter ("energy2") is not
+    a match, just as with \b.
+    """
+    seen = set()
+    for match in WORD_RE.finditer(sentence):
+        start, end = match.span()
+        token = match.group()
+        if ("'" not in token
+                and (start == 0 or not _is_word_char(sentence[start - 1]))
+                and (end == len(sentence) or not _is_word_char(sentence[end]))):
+            spans = [(start, end)]  # the common case: a plain word
+        else:
+            bounds = _word_boundaries(sentence, start, end)
+            spans = [(a, b) for i, a in enumerate(bounds) for b in bounds[i + 1:]]
+
+        for a, b in spans:
+            token = sentence[a:b].lower()
+            if token not in seen:
+                seen.add(token)
+                yield token, a, b
+
+
+def build_sentence_index(sentences):
+    """
+    Build an inverted index from each token to the sentences that contain it.
+
+    This is a single pass over the passage. For every sentence we record
+    where each lowercase token FIRST appears (see iter_blank_spans()), so
+    the index looks like:
+        {'energy': [(0, 4, 10), (3, 17, 23)], ...}
+    meaning (sentence number, start offset, end offset), in sentence order.
+    """
+    index = {}
+    for idx, sentence in enumerate(sentences):
+        for token, start, end in iter_blank_spans(sentence):
+            index.setdefault(token, []).append((idx, start, end))
+    return index
+
+
+def create_fill_in_blank_questions(sentences, keywords, max_questions=5, index=None):
     """
     Build fill-in-the-blank questions by hiding keywords inside sentences.
 
-    For each keyword, we find the first sentence that contains it and
-    replace the word with '_____' (case-insensitive match).
+    For each keyword, we find the first unused sentence that contains it and
+    replace the word with '_____' (case-insensitive match). The sentence
+    index (built once if not passed in) gives the sentence and the exact
+    character offsets, so no regex has to be compiled per keyword.
     """
+    if index is None:
+        index = build_sentence_index(sentences)
+
     questions = []
     used_sentences = set()
 
     for keyword in keywords:
-        keyword_lower = keyword.lower()
-        found_sentence = None
-
-        for idx, sentence in enumerate(sentences):
+        found = None
+        for idx, start, end in index.get(keyword.lower(), ()):
             # Skip sentences we've already used
-            if idx in used_sentences:
-                continue
-
-            # Case-insensitive check
-            if re.search(rf"\b{re.escape(keyword_lower)}\b", sentence, flags=re.IGNORECASE):
-                found_sentence = (idx, sentence)
+            if idx not in used_sentences:
+                found = (idx, start, end)
                 break
 
-        if found_sentence is None:
+        if found is None:
             continue
 
-        idx, sentence = found_sentence
+        idx, start, end = found
         used_sentences.add(idx)
 
         # Replace the first occurrence of the keyword with a blank
-        blank_sentence = re.sub(
-            rf"\b{re.escape(keyword_lower)}\b",
-            "_____",
-            sentence,
-            count=1,
-            flags=re.IGNORECASE
-        )
+        sentence = sentences[idx]
+        blank_sentence = sentence[:start] + "_____" + sentence[end:]
 
         questions.append({
             "keyword": keyword,
@@ -195,41 +291,405 @@ def print_fill_in_blank_section(questions):
     print()
 
 
-def print_comprehension_section():
+def print_multiple_choice_section(questions):
+    """
+    Print the multiple-choice questions and an answer key.
+    """
+    print("=" * 60)
+    print("SECTION 3: MULTIPLE-CHOICE QUESTIONS")
+    print("=" * 60)
+
+    if not questions:
+        print("No multiple-choice questions could be generated.")
+        print()
+        return
+
+    for i, q in enumerate(questions, start=1):
+        print(f"Q{i}: {fill(q['question'], width=70)}")
+        for letter, option in zip("ABCDEFGH", q["options"]):
+            print(f"    {letter}) {option}")
+        print()
+
+    print("-" * 60)
+    print("Answer Key:")
+    for i, q in enumerate(questions, start=1):
+        print(f"Q{i}: {q['answer']} ({q['keyword']})")
+    print()
+
+
+def print_comprehension_section(section_number=3):
     """
     Print some generic comprehension questions that work for any passage.
     """
     print("=" * 60)
-    print("SECTION 3: COMPREHENSION QUESTIONS")
+    print(f"SECTION {section_number}: COMPREHENSION QUESTIONS")
     print("=" * 60)
-    questions = [
-        "1. In your own words, what is the main idea of this passage?",
-        "2. List two important details that support the main idea.",
-        "3. Why do you think this information is important or useful?",
-        "4. Is there anything in the passage that you found confusing? What is it?",
-        "5. How could you apply what you learned from this passage in real life?"
-    ]
-    for q in questions:
-        print(q)
+    for i, q in enumerate(COMPREHENSION_QUESTIONS, start=1):
+        print(f"{i}. {q}")
     print()
 
 
-def main():
-    passage = read_passage_from_user()
+def load_df_table(table_dir):
+    """
+    Load a corpus DF table. Imported lazily so NumPy is only needed when
+    corpus-level keyword scoring is actually used.
+    """
+    from keyword_scoring import DocumentFrequencyTable
+    return DocumentFrequencyTable.load(table_dir)
 
-    if not passage:
-        print("No passage was entered. Exiting.")
-        return
 
+def generate_quiz(passage, max_keywords=8, min_length=4, max_questions=5, df_table=None,
+                  multiple_choice=False):
+    """
+    Run the full pipeline on one passage and return the quiz as a dict:
+        {'keywords', 'counts', 'questions', 'answer_key', 'comprehension_questions'}
+
+    When a DF table is given, keywords are ranked by TF-IDF against it.
+    With multiple_choice=True the dict also gets a 'multiple_choice' list.
+    """
     tokens = tokenize_words(passage)
     sentences = split_sentences(passage)
 
-    keywords, counts = extract_keywords(tokens, max_keywords=8, min_length=4)
-    fill_in_questions = create_fill_in_blank_questions(sentences, keywords, max_questions=5)
+    if df_table is not None:
+        from keyword_scoring import extract_keywords_tfidf
+        keywords, counts = extract_keywords_tfidf(
+            tokens, df_table, max_keywords=max_keywords, min_length=min_length
+        )
+    else:
+        keywords, counts = extract_keywords(tokens, max_keywords=max_keywords, min_length=min_length)
+    questions = create_fill_in_blank_questions(sentences, keywords, max_questions=max_questions)
+
+    quiz = {
+        "keywords": keywords,
+        "counts": {word: counts[word] for word in keywords},
+        "questions": questions,
+        "answer_key": [q["keyword"] for q in questions],
+        "comprehension_questions": COMPREHENSION_QUESTIONS,
+    }
+    if multiple_choice:
+        # Imported lazily: NumPy/SciPy are only needed for this feature.
+        from distractors import create_multiple_choice_questions
+        quiz["multiple_choice"] = create_multiple_choice_questions(
+            sentences, questions, min_length=min_length
+        )
+    return quiz
+
+
+def iter_passages(source):
+    """
+    Yield (passage_id, text, path, error) for every passage in a batch source.
+
+    - A directory: every .txt file inside it (id = file name). Only the
+      path is passed along; the worker process reads the file itself.
+    - A .jsonl file: one {"id": ..., "text": ...} object per line
+      (id defaults to the line number, a missing or null text is "").
+      A line that is not a JSON object is passed on with an `error`
+      instead of stopping the batch.
+    """
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.lower().endswith(".txt"):
+                yield os.path.splitext(name)[0], None, os.path.join(source, name), None
+        return
+
+    with open(source, "r", encoding="utf-8", errors="replace") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield str(line_no), None, None, f"invalid JSON on line {line_no}: {exc}"
+                continue
+            if not isinstance(record, dict):
+                yield str(line_no), None, None, f"line {line_no} is not a JSON object"
+                continue
+            yield str(record.get("id", line_no)), record.get("text") or "", None, None
+
+
+# Set once per worker process by _init_worker().
+_worker_df_table = None
+_worker_multiple_choice = False
+
+
+def _init_worker(df_table_dir, multiple_choice=False):
+    """
+    Load the DF table once per worker. It is memory-mapped, so all workers
+    share the same pages instead of each holding a copy.
+    """
+    global _worker_df_table, _worker_multiple_choice
+    _worker_multiple_choice = multiple_choice
+    if df_table_dir:
+        _worker_df_table = load_df_table(df_table_dir)
+
+
+def _quiz_job(job):
+    """
+    Worker-process entry point for batch mode.
+
+    A passage that cannot be read or processed gives {"id": ..., "error": ...}
+    so one bad record never stops the rest of the batch.
+    """
+    passage_id, text, path, error = job
+    if error is not None:
+        return {"id": passage_id, "error": error}
+
+    try:
+        if path is not None:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                text = f.read()
+        if not isinstance(text, str):
+            raise TypeError(f"text must be a string, not {type(text).__name__}")
+
+        result = {"id": passage_id}
+        result.update(generate_quiz(
+            text.strip(), df_table=_worker_df_table, multiple_choice=_worker_multiple_choice
+        ))
+        return result
+    except Exception as exc:
+        return {"id": passage_id, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def run_batch(source, out_path, workers=None, chunksize=32, df_table_dir=None,
+              multiple_choice=False):
+    """
+    Generate quizzes for every passage in `source` using a process pool and
+    write them to `out_path` as JSONL, in the same order as the input.
+
+    Passages are streamed to the workers in chunks and results are written
+    as they come back, so memory stays flat for very large collections.
+    Returns (quizzes written, passages that failed with an "error" line).
+    """
+    count = errors = 0
+    pool = Pool(processes=workers, initializer=_init_worker,
+                initargs=(df_table_dir, multiple_choice))
+    with pool, open(out_path, "w", encoding="utf-8") as out:
+        for result in pool.imap(_quiz_job, iter_passages(source), chunksize=chunksize):
+            out.write(json.dumps(result) + "\n")
+            count += 1
+            errors += "error" in result
+    return count - errors, errors
+
+
+def iter_sentences(lines, max_sentence_chars=20000):
+    """
+    Yield sentences from an iterable of lines (a file, stdin, ...).
+
+    Uses the same rule as split_sentences(), but only the unfinished end
+    of the text is kept in memory. A boundary is only accepted once more
+    text follows it, exactly like splitting the joined passage would.
+    A run-on "sentence" longer than max_sentence_chars is cut off so the
+    buffer stays bounded.
+    """
+    buffer = ""
+    for line in lines:
+        buffer += line.rstrip("\n") + "\n"
+
+        start = 0
+        for match in SENTENCE_END_RE.finditer(buffer):
+            if match.end() == len(buffer):
+                break
+            sentence = buffer[start:match.start()].strip()
+            if sentence:
+                yield sentence
+            start = match.end()
+        buffer = buffer[start:]
+
+        if len(buffer) > max_sentence_chars:
+            yield buffer.strip()
+            buffer = ""
+
+    tail = buffer.strip()
+    if tail:
+        yield tail
+
+
+class StreamingQuizBuilder:
+    """
+    Build a quiz from sentences that arrive one at a time.
+
+    Memory use:
+        - counts:     one counter per distinct keyword-sized word
+                      (bounded by the vocabulary, not the text length)
+        - candidates: up to `per_word` sentence ids for each word,
+                      in the order the sentences appeared
+        - pool:       the candidate sentences themselves, never more than
+                      `max_pool` of them
+
+    When the pool fills up, candidates are only kept for the `keep_top`
+    best-ranked words so far and unreferenced sentences are dropped. Words
+    are ranked by frequency, or by TF-IDF when a DF table is given.
+    """
+
+    def __init__(self, min_length=4, per_word=5, max_pool=5000, keep_top=200, df_table=None):
+        self.min_length = min_length
+        self.per_word = per_word
+        self.max_pool = max_pool
+        self.keep_top = keep_top
+        self.df_table = df_table
+        self.counts = Counter()
+        self.candidates = {}
+        self.pool = {}
+        self.sentences_seen = 0
+
+    def add_sentence(self, sentence):
+        words = [
+            t for t in tokenize_words(sentence)
+            if t not in STOPWORDS and len(t) >= self.min_length
+        ]
+        self.counts.update(words)
+
+        sentence_id = self.sentences_seen
+        self.sentences_seen += 1
+
+        is_candidate = False
+        for word, _, _ in iter_blank_spans(sentence):
+            if word in STOPWORDS or len(word) < self.min_length:
+                continue
+            ids = self.candidates.setdefault(word, [])
+            if len(ids) < self.per_word:
+                ids.append(sentence_id)
+                is_candidate = True
+
+        if is_candidate:
+            self.pool[sentence_id] = sentence
+            if len(self.pool) > self.max_pool:
+                self._prune()
+
+    def _top_words(self, n):
+        if self.df_table is not None:
+            from keyword_scoring import rank_keywords_tfidf
+            return rank_keywords_tfidf(self.counts, self.df_table, max_keywords=n)
+        return [word for word, _ in self.counts.most_common(n)]
+
+    def _prune(self):
+        keep = set(self._top_words(self.keep_top))
+        self.candidates = {w: ids for w, ids in self.candidates.items() if w in keep}
+        referenced = {i for ids in self.candidates.values() for i in ids}
+        self.pool = {i: s for i, s in self.pool.items() if i in referenced}
+
+    def build_quiz(self, max_keywords=8, max_questions=5, multiple_choice=False):
+        """
+        Return the quiz in the same shape as generate_quiz().
+
+        With multiple_choice=True, distractors come from a co-occurrence
+        model over the sentence pool, since the full text is not kept.
+        """
+        keywords = self._top_words(max_keywords)
+
+        questions = []
+        used_sentences = set()
+        for keyword in keywords:
+            for sentence_id in self.candidates.get(keyword, ()):
+                if sentence_id in used_sentences:
+                    continue
+                sentence = self.pool[sentence_id]
+                for token, start, end in iter_blank_spans(sentence):
+                    if token == keyword:
+                        used_sentences.add(sentence_id)
+                        questions.append({
+                            "keyword": keyword,
+                            "question": sentence[:start] + "_____" + sentence[end:]
+                        })
+                        break
+                break
+
+            if len(questions) >= max_questions:
+                break
+
+        quiz = {
+            "keywords": keywords,
+            "counts": {word: self.counts[word] for word in keywords},
+            "questions": questions,
+            "answer_key": [q["keyword"] for q in questions],
+            "comprehension_questions": COMPREHENSION_QUESTIONS,
+        }
+        if multiple_choice:
+            from distractors import create_multiple_choice_questions
+            quiz["multiple_choice"] = create_multiple_choice_questions(
+                list(self.pool.values()), questions, min_length=self.min_length
+            )
+        return quiz
+
+
+def generate_quiz_streaming(lines, max_keywords=8, min_length=4, max_questions=5, df_table=None,
+                            multiple_choice=False):
+    """
+    Stream lines of text through StreamingQuizBuilder and return the quiz.
+    Keeping max_questions candidates per word means the keywords and
+    fill-in-the-blank questions match generate_quiz() unless the sentence
+    pool had to be pruned.
+    """
+    builder = StreamingQuizBuilder(min_length=min_length, per_word=max_questions, df_table=df_table)
+    for sentence in iter_sentences(lines):
+        builder.add_sentence(sentence)
+    return builder.build_quiz(max_keywords=max_keywords, max_questions=max_questions,
+                              multiple_choice=multiple_choice)
+
+
+def _lines_until_end(stream):
+    """
+    Yield lines from stdin until EOF or a line containing only 'END'.
+    """
+    for line in stream:
+        if line.strip().upper() == "END":
+            break
+        yield line
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="NLP Quiz Generator")
+    parser.add_argument("--batch", metavar="SOURCE",
+                        help="folder of .txt passages or a .jsonl file of {id, text} records")
+    parser.add_argument("--out", default="quizzes.jsonl",
+                        help="output JSONL file for --batch (default: quizzes.jsonl)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for --batch (default: one per CPU core)")
+    parser.add_argument("--df-table", metavar="DIR",
+                        help="rank keywords by TF-IDF using a DF table built by keyword_scoring.py")
+    parser.add_argument("--stream", nargs="?", const="-", metavar="FILE",
+                        help="stream a long passage from FILE (or stdin) with bounded memory")
+    parser.add_argument("--multiple-choice", action="store_true",
+                        help="also build 4-option multiple-choice questions")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.batch:
+        count, errors = run_batch(args.batch, args.out, workers=args.workers,
+                                  df_table_dir=args.df_table, multiple_choice=args.multiple_choice)
+        print(f"Generated {count} quizzes -> {args.out}")
+        if errors:
+            print(f"{errors} passages failed; see the \"error\" lines in {args.out}")
+        return
 
-    print_keywords_section(keywords, counts)
-    print_fill_in_blank_section(fill_in_questions)
-    print_comprehension_section()
+    df_table = load_df_table(args.df_table) if args.df_table else None
+    if args.stream:
+        options = {"df_table": df_table, "multiple_choice": args.multiple_choice}
+        if args.stream == "-":
+            quiz = generate_quiz_streaming(_lines_until_end(sys.stdin), **options)
+        else:
+            with open(args.stream, "r", encoding="utf-8", errors="ignore") as f:
+                quiz = generate_quiz_streaming(f, **options)
+    else:
+        passage = read_passage_from_user()
+
+        if not passage:
+            print("No passage was entered. Exiting.")
+            return
+
+        quiz = generate_quiz(passage, df_table=df_table, multiple_choice=args.multiple_choice)
+
+    print_keywords_section(quiz["keywords"], quiz["counts"])
+    print_fill_in_blank_section(quiz["questions"])
+    if "multiple_choice" in quiz:
+        print_multiple_choice_section(quiz["multiple_choice"])
+        print_comprehension_section(section_number=4)
+    else:
+        print_comprehension_section()
 
     print("=" * 60)
     print("Quiz generation complete.")
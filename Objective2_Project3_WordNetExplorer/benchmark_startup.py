@@ -0,0 +1,117 @@
+"""
+Objective 2 - Project 3: WordNet Explorer (startup benchmark)
+
+Measures how long the explorer takes to become usable, each in a fresh
+Python process:
+- importing wordnet_explorer (NLTK is NOT imported at this point)
+- the offline data check (--check-data)
+- time until the "Enter a word:" prompt appears
+- time until the first lookup ("dog") has been printed
+
+The last two are measured twice: with the default background loading and
+with --eager (WordNet fully loaded before the prompt, the old behaviour).
+
+How to run:
+    python benchmark_startup.py --repeats 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+EXPLORER = os.path.join(HERE, "wordnet_explorer.py")
+PROMPT = b"Enter a word: "
+
+
+def time_command(args, repeats):
+    """
+    Median wall time (seconds) of running a command to completion.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=HERE, stdout=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def read_until(proc, marker, buffer=b""):
+    """
+    Read the child's stdout until marker appears. Returns the leftover bytes.
+    """
+    while marker not in buffer:
+        chunk = os.read(proc.stdout.fileno(), 4096)
+        if not chunk:
+            raise RuntimeError("wordnet_explorer.py exited early:\n" + buffer.decode(errors="ignore"))
+        buffer += chunk
+    return buffer.split(marker, 1)[1]
+
+
+def time_interactive(flags, repeats, word="dog"):
+    """
+    Median (time to prompt, time to first lookup result) in seconds.
+    """
+    to_prompt, to_result = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, "-u", EXPLORER, *flags],
+            cwd=HERE, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+        try:
+            rest = read_until(proc, PROMPT)
+            to_prompt.append(time.perf_counter() - start)
+
+            proc.stdin.write(f"{word}\n".encode())
+            proc.stdin.flush()
+            # The next prompt means the whole result has been printed.
+            read_until(proc, PROMPT, rest)
+            to_result.append(time.perf_counter() - start)
+
+            proc.stdin.write(b"quit\n")
+            proc.stdin.flush()
+            proc.wait(timeout=30)
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+    return statistics.median(to_prompt), statistics.median(to_result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WordNet Explorer startup time.")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    python = sys.executable
+    baseline = time_command([python, "-c", "pass"], args.repeats)
+    rows = [
+        ("python interpreter only", baseline),
+        ("import nltk (for reference)", time_command([python, "-c", "import nltk"], args.repeats)),
+        ("import wordnet_explorer", time_command([python, "-c", "import wordnet_explorer"], args.repeats)),
+    ]
+
+    check = subprocess.run([python, EXPLORER, "--check-data"], cwd=HERE, stdout=subprocess.DEVNULL)
+    if check.returncode == 0:
+        rows.append(("--check-data", time_command([python, EXPLORER, "--check-data"], args.repeats)))
+        # Make sure the lookup index exists so both modes load the same cache.
+        time_interactive([], 1)
+        for label, flags in (("background load", []), ("--eager", ["--eager"])):
+            prompt, result = time_interactive(flags, args.repeats)
+            rows.append((f"{label}: prompt shown", prompt))
+            rows.append((f"{label}: first lookup done", result))
+    else:
+        print("WordNet data is not installed, so only import times are measured.")
+        print("Run wordnet_explorer.py once to download it.\n")
+
+    print(f"{'step':<36}{'median (s)':>12}")
+    print("-" * 48)
+    for label, seconds in rows:
+        print(f"{label:<36}{seconds:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
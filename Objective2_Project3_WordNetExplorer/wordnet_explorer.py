@@ -10,11 +10,186 @@ This tool uses NLTK's WordNet to explore words:
 - Related word forms (lemmas)
 
 It also auto-downloads required NLTK data the first time you run it.
+
+Lookups are served from a preloaded INDEX instead of NLTK's lazy corpus
+reader. The index is built once (by walking every synset and lemma) and
+cached on disk as a pickle. After that, each word maps straight to its
+senses, definitions, examples, synonyms and antonyms with a dict lookup,
+and loading the cache takes well under a second.
+
+BATCH mode enriches a whole word list (file or stdin) at once: words are
+normalized and de-duplicated, each unique word is resolved a single time
+(optionally across several worker processes), and the results are
+written as JSONL or CSV.
+
+Inflected forms ("running", "geese") and multi-word phrases ("ice cream")
+go through a MORPHOLOGY layer: the word is reduced to its WordNet base
+forms once, and the resulting senses are kept in a bounded LRU cache, so
+repeated lookups of the same form cost a single dict access. Cache hit
+statistics are shown with the 'stats' command.
+
+Word SIMILARITY (path, Wu-Palmer, Leacock-Chodorow) and "most similar
+words" search are available from the prompt; see wordnet_similarity.py.
+
+STARTUP is lazy: importing NLTK alone takes over a second and its corpus
+reader parses WordNet on first use, so the prompt appears first and
+WordNet (the cached index, then NLTK) loads in a background thread while
+you type. Checking that the WordNet data is installed only looks for the
+files and never imports NLTK.
 """
 
+import argparse
+import csv
+import gc
+import json
+import os
+import pickle
 import re
-import nltk
-from nltk.corpus import wordnet as wn
+import sys
+import threading
+from collections import OrderedDict
+from multiprocessing import Pool
+
+
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordnet_index.pkl")
+# Bump when the layout of the cached index changes.
+INDEX_FORMAT = 1
+
+# Each synset in the index is a plain tuple (fast to pickle and unpickle).
+SYN_NAME, SYN_POS, SYN_DEFINITION, SYN_EXAMPLES, SYN_LEMMAS, SYN_ANTONYMS = range(6)
+
+# Parts of speech in the order wn.synsets() tries them. Adjective lookups
+# also match adjective satellites ('s').
+MORPHY_POS = ("n", "v", "a", "r")
+POS_GROUPS = {"n": ("n",), "v": ("v",), "a": ("a", "s"), "r": ("r",)}
+
+# Loaded by load_wordnet_index(); None means "ask NLTK directly".
+_wordnet_index = None
+
+# NLTK's WordNet reader, imported and loaded on first use by get_wordnet().
+wn = None
+_wordnet_lock = threading.Lock()
+
+# Background startup (see start_background_load()).
+_index_ready = threading.Event()
+_index_ready.set()
+_loader_error = None
+
+
+class LookupCache:
+    """
+    Bounded LRU cache of word form -> synset records.
+
+    Real user input repeats the same inflected forms over and over
+    ("running", "children", ...). Reducing them to base forms goes
+    through NLTK's morphy rules every time, so the finished result is
+    cached instead.
+    """
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, word, resolve):
+        """
+        Return the cached value for word, calling resolve(word) on a miss.
+        """
+        cached = self.entries.get(word)
+        if cached is not None:
+            self.entries.move_to_end(word)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        value = resolve(word)
+        if self.max_size > 0:
+            self.entries[word] = value
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+_lookup_cache = LookupCache()
+
+
+def get_wordnet():
+    """
+    Return NLTK's WordNet reader, importing NLTK and loading the corpus on
+    first use. Thread-safe: a second caller waits for the first to finish.
+    """
+    global wn
+    with _wordnet_lock:
+        if wn is None:
+            from nltk.corpus import wordnet
+            wordnet.ensure_loaded()
+            wn = wordnet
+    return wn
+
+
+def nltk_data_dirs():
+    """
+    The folders nltk.data.find() searches, in the same order.
+
+    Computed here (mirroring nltk.data.path) so the data check does not
+    have to import NLTK. Once NLTK is imported, its own list is used.
+    """
+    if "nltk.data" in sys.modules:
+        return list(sys.modules["nltk.data"].path)
+
+    dirs = [os.path.expanduser(d) for d in os.environ.get("NLTK_DATA", "").split(os.pathsep) if d]
+    if os.path.expanduser("~/") != "~/":
+        dirs.append(os.path.expanduser("~/nltk_data"))
+    dirs += [
+        os.path.join(sys.prefix, "nltk_data"),
+        os.path.join(sys.prefix, "share", "nltk_data"),
+        os.path.join(sys.prefix, "lib", "nltk_data"),
+    ]
+    if sys.platform.startswith("win"):
+        dirs += [
+            os.path.join(os.environ.get("APPDATA", "C:\\"), "nltk_data"),
+            r"C:\nltk_data", r"D:\nltk_data", r"E:\nltk_data",
+        ]
+    else:
+        dirs += [
+            "/usr/share/nltk_data",
+            "/usr/local/share/nltk_data",
+            "/usr/lib/nltk_data",
+            "/usr/local/lib/nltk_data",
+        ]
+    return dirs
+
+
+def find_wordnet_data():
+    """
+    Return the path of the installed WordNet data (folder or .zip), or None.
+
+    Offline and cheap: it only checks that the files exist, without
+    importing NLTK or parsing the corpus.
+    """
+    for base in nltk_data_dirs():
+        for name in ("wordnet", "wordnet.zip"):
+            path = os.path.join(base, "corpora", name)
+            if os.path.exists(path):
+                return path
+    return None
 
 
 def ensure_wordnet_downloaded():
@@ -22,12 +197,230 @@ def ensure_wordnet_downloaded():
     Make sure WordNet and the Open Multilingual WordNet data are available.
     If not, download them.
     """
-    try:
-        _ = wn.synsets("test")
-    except LookupError:
-        print("NLTK WordNet data not found. Downloading now...")
-        nltk.download("wordnet")
-        nltk.download("omw-1.4")
+    if find_wordnet_data() is not None:
+        return
+
+    import nltk
+    print("NLTK WordNet data not found. Downloading now...")
+    nltk.download("wordnet")
+    nltk.download("omw-1.4")
+
+
+def wordnet_data_signature() -> str:
+    """
+    Identify the installed WordNet data WITHOUT parsing it: its path plus
+    the name, size and modification time of each data file.
+
+    It is stored in the cached indexes, so a different WordNet install, or
+    one upgraded in place, triggers a rebuild.
+    """
+    path = find_wordnet_data()
+    if path is None:
+        return ""
+    if os.path.isdir(path):
+        files = sorted(entry.path for entry in os.scandir(path) if entry.is_file())
+    else:
+        files = [path]
+    stats = []
+    for name in files:
+        st = os.stat(name)
+        stats.append([os.path.basename(name), st.st_size, st.st_mtime_ns])
+    return json.dumps([path, stats])
+
+
+def synset_record(syn):
+    """
+    Flatten an NLTK synset into the tuple stored in the index.
+    """
+    lemmas = syn.lemmas()
+    antonyms = sorted({ant.name() for lemma in lemmas for ant in lemma.antonyms()})
+    return (
+        syn.name(),
+        syn.pos(),
+        syn.definition(),
+        tuple(syn.examples()),
+        tuple(lemma.name() for lemma in lemmas),
+        tuple(antonyms),
+    )
+
+
+def build_wordnet_index():
+    """
+    Walk all of WordNet once and build the lookup index:
+        {'synsets': [record, ...], 'words': {word: [synset ids]}, ...}
+
+    Word entries use wn.synsets() itself, so sense order is identical to
+    what NLTK would return for that word.
+    """
+    wn = get_wordnet()
+    synsets = []
+    synset_ids = {}
+    for syn in wn.all_synsets():
+        synset_ids[syn.name()] = len(synsets)
+        synsets.append(synset_record(syn))
+
+    words = {}
+    for lemma_name in wn.all_lemma_names():
+        words[lemma_name.lower()] = [synset_ids[syn.name()] for syn in wn.synsets(lemma_name)]
+
+    return {
+        "format": INDEX_FORMAT,
+        "signature": wordnet_data_signature(),
+        "synsets": synsets,
+        "words": words,
+    }
+
+
+def save_wordnet_index(index, path=INDEX_PATH):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_wordnet_index(path=INDEX_PATH, rebuild=False):
+    """
+    Load the cached index, building and saving it first if it is missing,
+    stale, or a rebuild was requested. Returns the index and also makes it
+    the one used by the lookup functions below.
+    """
+    global _wordnet_index
+
+    index = None
+    if not rebuild and os.path.exists(path):
+        # Unpickling many small tuples is much faster with the GC paused.
+        gc.disable()
+        try:
+            with open(path, "rb") as f:
+                index = pickle.load(f)
+        finally:
+            gc.enable()
+        if index.get("format") != INDEX_FORMAT or index.get("signature") != wordnet_data_signature():
+            index = None
+
+    if index is None:
+        print("Building the WordNet lookup index (one time only)...")
+        index = build_wordnet_index()
+        save_wordnet_index(index, path)
+        print(f"Saved index to {path}")
+
+    _wordnet_index = index
+    # Cached records may point into the previous index.
+    _lookup_cache.clear()
+    return index
+
+
+def start_background_load(use_index=True, rebuild=False):
+    """
+    Load WordNet in a daemon thread so the prompt can appear right away.
+
+    The cached index is loaded first, and lookups only wait for that. NLTK
+    is imported and loaded afterwards, ready for inflected forms and the
+    similarity commands.
+    """
+    global _loader_error
+    _loader_error = None
+    _index_ready.clear()
+
+    def load():
+        global _loader_error
+        try:
+            if use_index:
+                load_wordnet_index(rebuild=rebuild)
+        except Exception as exc:
+            _loader_error = exc
+        finally:
+            _index_ready.set()
+
+        if _loader_error is None:
+            try:
+                get_wordnet()
+            except Exception:
+                # The first lookup that needs NLTK retries and reports it.
+                pass
+
+    thread = threading.Thread(target=load, name="wordnet-loader", daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_for_wordnet():
+    """
+    Block until a background load (if any) has the lookup index ready.
+    """
+    if not _index_ready.is_set():
+        print("(Still loading WordNet, one moment...)")
+        _index_ready.wait()
+    if _loader_error is not None:
+        raise _loader_error
+
+
+def lemmatize(word: str):
+    """
+    Reduce a word form to its WordNet base forms.
+
+    Returns (pos, base form) pairs in the order wn.synsets() tries them,
+    e.g. 'leaves' -> [('n', 'leaf'), ('n', 'leave'), ('v', 'leave')].
+    """
+    # _morphy() is the same routine wn.synsets() and NLTK's own
+    # WordNetLemmatizer use; it returns every analysis, not just the first.
+    wn = get_wordnet()
+    return [(pos, form) for pos in MORPHY_POS for form in wn._morphy(word, pos)]
+
+
+def resolve_synset_ids(word: str):
+    """
+    Map a word form to synset ids in the preloaded index.
+
+    Base forms are looked up directly. Anything else is lemmatized first,
+    which gives the same senses, in the same order, as wn.synsets(word).
+    """
+    words = _wordnet_index["words"]
+    ids = words.get(word)
+    if ids is not None:
+        return tuple(ids)
+
+    synsets = _wordnet_index["synsets"]
+    found = {}
+    for pos, form in lemmatize(word):
+        for i in words.get(form, ()):
+            if synsets[i][SYN_POS] in POS_GROUPS[pos]:
+                found[i] = None
+    return tuple(found)
+
+
+def _resolve_records(word: str):
+    if _wordnet_index is not None:
+        synsets = _wordnet_index["synsets"]
+        return tuple(synsets[i] for i in resolve_synset_ids(word))
+    return tuple(synset_record(syn) for syn in get_wordnet().synsets(word))
+
+
+def get_synset_records(word: str):
+    """
+    Return the synset records for a word (base form, inflected form, or
+    underscore-joined phrase).
+
+    Uses the preloaded index when available, otherwise NLTK. Either way
+    the result is memoized in the lookup cache.
+    """
+    wait_for_wordnet()
+    return _lookup_cache.get(word, _resolve_records)
+
+
+def base_form(word: str, pos: str) -> str:
+    """
+    Return the first WordNet base form of word for one part of speech, or
+    the word itself when it has none (e.g. 'geese' -> 'goose' for 'n').
+    """
+    for form_pos, form in lemmatize(word):
+        if form_pos == pos:
+            return form
+    return word
+
+
+def display_word(word: str) -> str:
+    return word.replace("_", " ")
 
 
 def normalize_word(text: str) -> str:
@@ -35,12 +428,15 @@ def normalize_word(text: str) -> str:
     Normalize input to a clean word form:
     - strip whitespace
     - lowercase
-    - keep only letters/apostrophes
+    - keep only letters/apostrophes/hyphens
+    - join the words of a phrase with underscores, the way WordNet
+      stores them ("ice cream" -> "ice_cream")
     """
     text = text.strip().lower()
-    # keep letters and apostrophes
-    text = re.sub(r"[^a-z']", "", text)
-    return text
+    # keep letters, apostrophes, hyphens and word breaks
+    text = re.sub(r"[^a-z'\-\s_]", "", text)
+    text = re.sub(r"[\s_]+", "_", text)
+    return text.strip("_-")
 
 
 def get_synonyms_antonyms(word: str):
@@ -50,11 +446,11 @@ def get_synonyms_antonyms(word: str):
     synonyms = set()
     antonyms = set()
 
-    for syn in wn.synsets(word):
-        for lemma in syn.lemmas():
-            synonyms.add(lemma.name().replace("_", " "))
-            for ant in lemma.antonyms():
-                antonyms.add(ant.name().replace("_", " "))
+    for record in get_synset_records(word):
+        for name in record[SYN_LEMMAS]:
+            synonyms.add(name.replace("_", " "))
+        for name in record[SYN_ANTONYMS]:
+            antonyms.add(name.replace("_", " "))
 
     return sorted(synonyms), sorted(antonyms)
 
@@ -63,23 +459,102 @@ def get_definitions_examples(word: str, max_senses=5):
     """
     Get WordNet senses with definitions and examples.
     """
-    senses = wn.synsets(word)
+    senses = get_synset_records(word)
     results = []
 
-    for syn in senses[:max_senses]:
-        definition = syn.definition()
-        examples = syn.examples()  # list
-        pos = syn.pos()  # n, v, a, r
+    for record in senses[:max_senses]:
         results.append({
-            "pos": pos,
-            "name": syn.name(),
-            "definition": definition,
-            "examples": examples
+            "pos": record[SYN_POS],  # n, v, a, s, r
+            "name": record[SYN_NAME],
+            "definition": record[SYN_DEFINITION],
+            "examples": list(record[SYN_EXAMPLES])
         })
 
     return results
 
 
+def lookup_entry(word: str, max_senses=6):
+    """
+    Resolve one word into a plain dict (used by batch mode).
+    """
+    synonyms, antonyms = get_synonyms_antonyms(word)
+    return {
+        "word": word,
+        "senses": get_definitions_examples(word, max_senses=max_senses),
+        "synonyms": synonyms,
+        "antonyms": antonyms,
+    }
+
+
+def read_word_list(source):
+    """
+    Read words (one per line) from a file path, or stdin when source is '-'.
+    Returns unique normalized words in first-seen order.
+    """
+    if source == "-":
+        lines = sys.stdin
+    else:
+        lines = open(source, "r", encoding="utf-8", errors="ignore")
+
+    unique = {}
+    with lines:
+        for line in lines:
+            word = normalize_word(line)
+            if word:
+                unique[word] = None
+    return list(unique)
+
+
+def _init_batch_worker(use_index):
+    # With fork, the parent's index is already shared; otherwise load it.
+    if use_index and _wordnet_index is None:
+        load_wordnet_index()
+
+
+def _batch_lookup(word):
+    return lookup_entry(word)
+
+
+def write_batch_results(entries, out_path):
+    """
+    Write lookup results as CSV (if out_path ends in .csv) or JSONL.
+    """
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        if out_path.lower().endswith(".csv"):
+            writer = csv.writer(f)
+            writer.writerow(["word", "num_senses", "definitions", "synonyms", "antonyms"])
+            for entry in entries:
+                writer.writerow([
+                    entry["word"],
+                    len(entry["senses"]),
+                    " | ".join(s["definition"] for s in entry["senses"]),
+                    ", ".join(entry["synonyms"]),
+                    ", ".join(entry["antonyms"]),
+                ])
+        else:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+
+
+def run_batch(source, out_path, workers=1, use_index=True, chunksize=256):
+    """
+    Look up every unique word in a word list and write the results.
+
+    Duplicates are removed before any lookup, so each word costs one lookup
+    no matter how often it appears in the list.
+    """
+    words = read_word_list(source)
+
+    if workers > 1:
+        with Pool(processes=workers, initializer=_init_batch_worker, initargs=(use_index,)) as pool:
+            entries = pool.imap(_batch_lookup, words, chunksize=chunksize)
+            write_batch_results(entries, out_path)
+    else:
+        write_batch_results((lookup_entry(word) for word in words), out_path)
+
+    return len(words)
+
+
 def pretty_pos(pos_code: str) -> str:
     """
     Convert WordNet POS codes to readable text.
@@ -98,8 +573,9 @@ def print_results(word: str):
     """
     Print WordNet exploration results for the given word.
     """
+    wait_for_wordnet()
     print("=" * 60)
-    print(f"WordNet Explorer: '{word}'")
+    print(f"WordNet Explorer: '{display_word(word)}'")
     print("=" * 60)
 
     senses = get_definitions_examples(word, max_senses=6)
@@ -146,19 +622,116 @@ def print_results(word: str):
 
     print("=" * 60)
     print("Tip: This is a simple NLP lexical knowledge tool.")
-    print("You can evolve it by adding: word similarity, phrase support,")
-    print("language translation, or a mini flashcard mode for TutiTech.")
+    print("Try 'similar <word>' or 'compare <word1> <word2>' for word similarity.")
+    print("You can evolve it by adding: language translation,")
+    print("or a mini flashcard mode for TutiTech.")
     print("=" * 60)
 
 
+def print_similar_words(word: str, k=10):
+    """
+    Print the top-k most similar nouns (or verbs) for each similarity metric.
+    """
+    # Imported here so NumPy is only loaded when similarity is used.
+    from wordnet_similarity import METRICS, get_similarity_index
+
+    print("=" * 60)
+    print(f"Most similar words to '{display_word(word)}'")
+    print("=" * 60)
+    for pos, label in (("n", "Nouns"), ("v", "Verbs")):
+        index = get_similarity_index(pos, wordnet=get_wordnet())
+        base = base_form(word, pos) if len(index.synsets_for_word(word)) == 0 else word
+        if len(index.synsets_for_word(base)) == 0:
+            continue
+        for metric in METRICS:
+            results = index.most_similar(base, k=k, metric=metric)
+            pretty = ", ".join(f"{w} ({score:.3f})" for w, score in results)
+            print(f"{label} / {metric}: {pretty or '(none)'}")
+        print()
+        return
+    print("No noun or verb senses found for that word.")
+    print()
+
+
+def print_word_comparison(word1: str, word2: str):
+    """
+    Print path, Wu-Palmer and Leacock-Chodorow similarity for two words.
+    """
+    from wordnet_similarity import METRICS, get_similarity_index
+
+    print("=" * 60)
+    print(f"Similarity: '{display_word(word1)}' vs '{display_word(word2)}'")
+    print("=" * 60)
+    found = False
+    for pos, label in (("n", "Noun"), ("v", "Verb")):
+        index = get_similarity_index(pos, wordnet=get_wordnet())
+        base1, base2 = base_form(word1, pos), base_form(word2, pos)
+        if len(index.synsets_for_word(base1)) == 0 or len(index.synsets_for_word(base2)) == 0:
+            continue
+        found = True
+        for metric in METRICS:
+            score = index.word_similarity(base1, base2, metric=metric)
+            shown = "n/a" if score is None else f"{score:.3f}"
+            print(f"{label} {metric:>4}: {shown}")
+    if not found:
+        print("These words do not share a noun or verb hierarchy.")
+    print()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Objective 2 - Project 3: WordNet Explorer")
+    parser.add_argument("--rebuild-index", action="store_true",
+                        help="rebuild the cached WordNet lookup index")
+    parser.add_argument("--no-index", action="store_true",
+                        help="query NLTK directly instead of using the cached index")
+    parser.add_argument("--batch", metavar="WORD_LIST",
+                        help="look up every word in a file (one per line, '-' for stdin)")
+    parser.add_argument("--out", default="wordnet_results.jsonl",
+                        help="output file for --batch; .csv or .jsonl (default: wordnet_results.jsonl)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for --batch (default: 1)")
+    parser.add_argument("--cache-size", type=int, default=4096,
+                        help="LRU lookup cache size, 0 to disable (default: 4096)")
+    parser.add_argument("--eager", action="store_true",
+                        help="load WordNet before showing the prompt instead of in the background")
+    parser.add_argument("--check-data", action="store_true",
+                        help="report whether the WordNet data is installed (offline, no corpus parse) and exit")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    _lookup_cache.max_size = args.cache_size
+
+    if args.check_data:
+        path = find_wordnet_data()
+        if path is None:
+            print("WordNet data: NOT FOUND (run without --check-data to download it)")
+            sys.exit(1)
+        print(f"WordNet data: {path}")
+        print(f"Lookup index: {INDEX_PATH if os.path.exists(INDEX_PATH) else 'not built yet'}")
+        return
+
     ensure_wordnet_downloaded()
+    if args.batch or args.eager:
+        if not args.no_index:
+            load_wordnet_index(rebuild=args.rebuild_index)
+        get_wordnet()
+    else:
+        start_background_load(use_index=not args.no_index, rebuild=args.rebuild_index)
+
+    if args.batch:
+        count = run_batch(args.batch, args.out, workers=args.workers, use_index=not args.no_index)
+        print(f"Looked up {count} unique words -> {args.out}")
+        return
 
     print("=" * 60)
     print("Objective 2 - Project 3: WordNet Explorer")
     print("Create and evolve natural language processing systems.")
     print("=" * 60)
     print("Type a word to explore its meaning, synonyms, and antonyms.")
+    print("Type 'similar <word>' or 'compare <word1> <word2>' for word similarity.")
+    print("Phrases work too (e.g. 'ice cream'). Type 'stats' for lookup cache stats.")
     print("Type 'quit' or 'exit' to leave.\n")
 
     while True:
@@ -166,10 +739,22 @@ def main():
         if user_input.strip().lower() in ("quit", "exit"):
             print("Goodbye! Thanks for exploring WordNet.")
             break
+        if user_input.strip().lower() == "stats":
+            print("Lookup cache:", json.dumps(_lookup_cache.stats()))
+            continue
+
+        command, _, rest = user_input.strip().partition(" ")
+        if command.lower() == "similar" and rest.strip():
+            print_similar_words(normalize_word(rest))
+            continue
+        if command.lower() == "compare" and len(rest.split()) == 2:
+            word1, word2 = (normalize_word(w) for w in rest.split())
+            print_word_comparison(word1, word2)
+            continue
 
         word = normalize_word(user_input)
         if not word:
-            print("Please enter a real word (letters only).")
+            print("Please enter a real word or phrase (letters only).")
             continue
 
         print_results(word)
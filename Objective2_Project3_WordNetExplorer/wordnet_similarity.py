@@ -0,0 +1,364 @@
+"""
+Objective 2 - Project 3: WordNet Explorer (word similarity)
+
+Adds word similarity to the explorer:
+- Path similarity          1 / (shortest path + 1)
+- Wu-Palmer similarity     based on the depth of the lowest common hypernym
+- Leacock-Chodorow (LCH)   -log((shortest path + 1) / (2 * max taxonomy depth))
+
+plus "top-k most similar words" search over a whole hierarchy (nouns or
+verbs). The numbers match NLTK's path_similarity(), wup_similarity() and
+lch_similarity().
+
+Calling NLTK once per synset pair is far too slow for a top-k search over
+80,000+ noun synsets. Instead, the hierarchy is flattened ONCE into NumPy
+arrays and cached on disk:
+- for every synset, its ancestors and the shortest distance to each
+- the same data grouped by ancestor (every synset BELOW each ancestor)
+- min/max depth of every synset, and the lemma -> synset table
+
+A query then walks only the query synset's own ancestors (about a dozen)
+and, for each one, updates all of its descendants at once with NumPy.
+"""
+
+import os
+
+import numpy as np
+
+from wordnet_explorer import wordnet_data_signature
+
+SIMILARITY_DIR = os.path.dirname(os.path.abspath(__file__))
+METRICS = ("path", "wup", "lch")
+ROOT_NAME = "*ROOT*"
+# Distance used for "not connected"; far larger than any real path.
+UNREACHABLE = 1 << 20
+
+
+def _similarity_path(pos):
+    return os.path.join(SIMILARITY_DIR, f"wordnet_similarity_{pos}.npz")
+
+
+class SimilarityIndex:
+    """
+    Precomputed hypernym structure for one part of speech.
+
+    Synsets are numbered 0..n-1. When the hierarchy has no single root
+    (verbs), NLTK simulates a shared "*ROOT*" above everything; here that
+    root is ancestor number n.
+    """
+
+    def __init__(self, arrays):
+        self.pos = str(arrays["pos"])
+        self.names = arrays["names"]
+        self.min_depth = arrays["min_depth"]
+        self.max_depth = arrays["max_depth"]
+        self.anc_indptr = arrays["anc_indptr"]
+        self.anc_ids = arrays["anc_ids"]
+        self.anc_dist = arrays["anc_dist"]
+        self.desc_indptr = arrays["desc_indptr"]
+        self.desc_ids = arrays["desc_ids"]
+        self.desc_dist = arrays["desc_dist"]
+        self.words = arrays["words"]
+        self.lemma_word = arrays["lemma_word"]
+        self.lemma_synset = arrays["lemma_synset"]
+        self.lch_depth = int(arrays["lch_depth"])
+        self.has_root = bool(arrays["has_root"])
+        # Which WordNet data the arrays were built from (wordnet_data_signature()).
+        self.signature = str(arrays.get("signature", ""))
+
+        self.num_synsets = len(self.names)
+        self.word_ids = {str(w): i for i, w in enumerate(self.words)}
+
+        # word id -> synset ids, as CSR-style offsets into lemma_synset
+        order = np.argsort(self.lemma_word, kind="stable")
+        self._word_synsets = self.lemma_synset[order]
+        self._word_indptr = np.searchsorted(
+            self.lemma_word[order], np.arange(len(self.words) + 1)
+        )
+
+    # -----------------------------
+    # Building / caching
+    # -----------------------------
+    @classmethod
+    def build(cls, pos="n", wordnet=None):
+        """
+        Flatten one WordNet hierarchy into arrays (slow, done once).
+
+        `wordnet` is an already-loaded NLTK WordNet reader; by default NLTK
+        is imported here, so loading cached arrays never needs it.
+        """
+        if wordnet is None:
+            from nltk.corpus import wordnet
+        synsets = list(wordnet.all_synsets(pos))
+        ids = {syn.name(): i for i, syn in enumerate(synsets)}
+        n = len(synsets)
+        # Same rule as NLTK's Synset._needs_root() for WordNet 3.x.
+        has_root = pos != "n"
+
+        hypernyms = []
+        for syn in synsets:
+            hyps = syn.hypernyms() + syn.instance_hypernyms()
+            hypernyms.append([ids[h.name()] for h in hyps if h.name() in ids])
+
+        # Shortest distance to every ancestor, min depth and max depth,
+        # memoized so shared parts of the hierarchy are only walked once.
+        distances = [None] * n
+        min_depth = np.zeros(n, dtype=np.int32)
+        max_depth = np.zeros(n, dtype=np.int32)
+
+        def visit(i):
+            if distances[i] is not None:
+                return distances[i]
+            dist = {i: 0}
+            if hypernyms[i]:
+                for h in hypernyms[i]:
+                    for a, d in visit(h).items():
+                        if d + 1 < dist.get(a, d + 2):
+                            dist[a] = d + 1
+                min_depth[i] = 1 + min(min_depth[h] for h in hypernyms[i])
+                max_depth[i] = 1 + max(max_depth[h] for h in hypernyms[i])
+            distances[i] = dist
+            return dist
+
+        rows, cols, vals = [], [], []
+        for i in range(n):
+            dist = visit(i)
+            for a, d in dist.items():
+                rows.append(i)
+                cols.append(a)
+                vals.append(d)
+            if has_root:
+                rows.append(i)
+                cols.append(n)
+                vals.append(max(dist.values()) + 1)
+
+        rows = np.array(rows, dtype=np.int32)
+        cols = np.array(cols, dtype=np.int32)
+        vals = np.array(vals, dtype=np.int16)
+        num_ancestors = n + 1 if has_root else n
+
+        by_row = np.lexsort((cols, rows))
+        by_col = np.lexsort((rows, cols))
+
+        words = {}
+        lemma_word, lemma_synset = [], []
+        for i, syn in enumerate(synsets):
+            for lemma in syn.lemmas():
+                w = words.setdefault(lemma.name().lower(), len(words))
+                lemma_word.append(w)
+                lemma_synset.append(i)
+
+        lch_depth = int(max_depth.max()) if n else 0
+        if has_root:
+            lch_depth += 1
+
+        return cls({
+            "pos": np.array(pos),
+            "names": np.array([syn.name() for syn in synsets]),
+            "min_depth": min_depth,
+            "max_depth": max_depth,
+            "anc_indptr": np.searchsorted(rows[by_row], np.arange(n + 1)).astype(np.int64),
+            "anc_ids": cols[by_row],
+            "anc_dist": vals[by_row],
+            "desc_indptr": np.searchsorted(cols[by_col], np.arange(num_ancestors + 1)).astype(np.int64),
+            "desc_ids": rows[by_col],
+            "desc_dist": vals[by_col],
+            "words": np.array(list(words)),
+            "lemma_word": np.array(lemma_word, dtype=np.int32),
+            "lemma_synset": np.array(lemma_synset, dtype=np.int32),
+            "lch_depth": np.array(lch_depth),
+            "has_root": np.array(has_root),
+            "signature": np.array(wordnet_data_signature()),
+        })
+
+    def save(self, path):
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            pos=np.array(self.pos), names=self.names,
+            min_depth=self.min_depth, max_depth=self.max_depth,
+            anc_indptr=self.anc_indptr, anc_ids=self.anc_ids, anc_dist=self.anc_dist,
+            desc_indptr=self.desc_indptr, desc_ids=self.desc_ids, desc_dist=self.desc_dist,
+            words=self.words, lemma_word=self.lemma_word, lemma_synset=self.lemma_synset,
+            lch_depth=np.array(self.lch_depth), has_root=np.array(self.has_root),
+            signature=np.array(self.signature),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, pos="n", rebuild=False, wordnet=None):
+        """
+        Load the cached arrays for a part of speech, building them if they
+        are missing or were built from different WordNet data.
+        """
+        path = _similarity_path(pos)
+        if not rebuild and os.path.exists(path):
+            with np.load(path) as arrays:
+                index = cls({key: arrays[key] for key in arrays.files})
+            if index.signature == wordnet_data_signature():
+                return index
+
+        print(f"Building the WordNet similarity index for pos='{pos}' (one time only)...")
+        index = cls.build(pos, wordnet=wordnet)
+        index.save(path)
+        return index
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def _ancestor_name(self, a):
+        return ROOT_NAME if a == self.num_synsets else str(self.names[a])
+
+    def _ancestor_depths(self, a):
+        # The simulated root sits at depth 0.
+        if a == self.num_synsets:
+            return 0, 0
+        return int(self.min_depth[a]), int(self.max_depth[a])
+
+    def synsets_for_word(self, word):
+        w = self.word_ids.get(word.lower().replace(" ", "_"))
+        if w is None:
+            return np.array([], dtype=np.int32)
+        return self._word_synsets[self._word_indptr[w]:self._word_indptr[w + 1]]
+
+    def _ancestors_of(self, a):
+        """
+        (ancestor ids, distances) for synset a, including a itself.
+        """
+        if a == self.num_synsets:
+            return np.array([a]), np.array([0], dtype=np.int64)
+        lo, hi = self.anc_indptr[a], self.anc_indptr[a + 1]
+        return self.anc_ids[lo:hi], self.anc_dist[lo:hi].astype(np.int64)
+
+    def _distance_table(self, ancestors):
+        """
+        Dense (len(ancestors) x num_synsets) table: how far every synset is
+        below each ancestor, UNREACHABLE where it is not below it.
+        """
+        table = np.full((len(ancestors), self.num_synsets), UNREACHABLE, dtype=np.int64)
+        for k, a in enumerate(ancestors):
+            lo, hi = self.desc_indptr[a], self.desc_indptr[a + 1]
+            table[k, self.desc_ids[lo:hi]] = self.desc_dist[lo:hi]
+        return table
+
+    def synset_scores(self, q, metric="path"):
+        """
+        Similarity between synset q and EVERY synset of this hierarchy.
+        Returns a float array; NaN where NLTK would return None.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"unknown metric {metric!r}, expected one of {METRICS}")
+
+        ancestors, q_dist = self._ancestors_of(q)
+        table = self._distance_table(ancestors)
+
+        if metric == "wup":
+            return self._wup_scores(q, ancestors, q_dist, table)
+
+        # Shortest path between q and every synset: the best route through
+        # any of q's ancestors.
+        dist = (q_dist[:, None] + table).min(axis=0)
+        connected = dist < UNREACHABLE
+
+        scores = np.full(self.num_synsets, np.nan)
+        if metric == "path":
+            scores[connected] = 1.0 / (dist[connected] + 1.0)
+        elif self.lch_depth > 0:
+            scores[connected] = -np.log((dist[connected] + 1.0) / (2.0 * self.lch_depth))
+        return scores
+
+    def _wup_scores(self, q, ancestors, q_dist, table):
+        # NLTK picks the common hypernym with the greatest MIN depth,
+        # preferring q itself and otherwise the alphabetically first name.
+        # Visiting q's ancestors in that order, the first one that covers a
+        # synset is exactly its lowest common hypernym (LCS) with q.
+        order = sorted(
+            range(len(ancestors)),
+            key=lambda k: (-self._ancestor_depths(ancestors[k])[0],
+                           ancestors[k] != q,
+                           self._ancestor_name(ancestors[k])),
+        )
+        position = {int(a): k for k, a in enumerate(ancestors)}
+
+        scores = np.full(self.num_synsets, np.nan)
+        unassigned = np.ones(self.num_synsets, dtype=bool)
+        for k in order:
+            rows = np.flatnonzero(unassigned & (table[k] < UNREACHABLE))
+            if len(rows) == 0:
+                continue
+            unassigned[rows] = False
+
+            # Like NLTK, the distance from each synset to the LCS is a true
+            # shortest path, which may route through one of the LCS's own
+            # ancestors. Those ancestors are all ancestors of q too, so
+            # their rows are already in the table.
+            lcs = ancestors[k]
+            lcs_ancestors, lcs_dist = self._ancestors_of(lcs)
+            ks = [position[int(a)] for a in lcs_ancestors]
+            len1 = (lcs_dist + q_dist[ks]).min()
+            len2 = (lcs_dist[:, None] + table[ks][:, rows]).min(axis=0)
+
+            depth = self._ancestor_depths(lcs)[1] + 1.0
+            scores[rows] = (2.0 * depth) / (len1 + len2 + 2.0 * depth)
+        return scores
+
+    def word_scores(self, word, metric="path"):
+        """
+        Similarity between `word` and every word in the hierarchy (the best
+        score over all sense pairs). Returns None for unknown words.
+        """
+        synset_ids = self.synsets_for_word(word)
+        if len(synset_ids) == 0:
+            return None
+
+        best = np.full(self.num_synsets, -np.inf)
+        for q in synset_ids:
+            best = np.fmax(best, self.synset_scores(int(q), metric))
+        best[np.isnan(best)] = -np.inf
+
+        scores = np.full(len(self.words), -np.inf)
+        np.maximum.at(scores, self.lemma_word, best[self.lemma_synset])
+        return scores
+
+    def word_similarity(self, word1, word2, metric="path"):
+        """
+        Similarity of two words, or None if either is unknown or unrelated.
+        """
+        w2 = self.word_ids.get(word2.lower().replace(" ", "_"))
+        if w2 is None:
+            return None
+        scores = self.word_scores(word1, metric)
+        if scores is None or np.isinf(scores[w2]):
+            return None
+        return float(scores[w2])
+
+    def most_similar(self, word, k=10, metric="path"):
+        """
+        Top-k most similar words as a list of (word, score), best first.
+        """
+        scores = self.word_scores(word, metric)
+        if scores is None:
+            return []
+
+        key = word.lower().replace(" ", "_")
+        if key in self.word_ids:
+            scores[self.word_ids[key]] = -np.inf
+
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(str(self.words[i]).replace("_", " "), float(scores[i])) for i in top]
+
+
+_loaded = {}
+
+
+def get_similarity_index(pos="n", wordnet=None):
+    """
+    Return the similarity index for a part of speech, loading it once.
+    """
+    if pos not in _loaded:
+        _loaded[pos] = SimilarityIndex.load(pos, wordnet=wordnet)
+    return _loaded[pos]
@@ -0,0 +1,195 @@
+"""
+Objective 3 - Project 1: Smart Temperature Predictor (walk-forward backtest)
+
+train.py scores the model on ONE 80/20 split. A single split can be lucky
+or unlucky, so this script evaluates many cutoff points instead:
+
+    fold 1:  train [.........]  test [..]
+    fold 2:  train [...........]  test [..]
+    fold 3:  train [.............]  test [..]
+
+- expanding window: every fold trains on all readings before its cutoff
+- sliding window:   every fold trains on the last --train-rows readings
+
+The feature matrix is built once and saved as .npy files in a temporary
+folder. Worker processes open them with np.load(mmap_mode="r"), so every
+fold reads the same pages from the OS cache and nothing is pickled to the
+workers except four integers per fold.
+
+Per-fold MAE / RMSE and fit / predict timings, plus their averages, are
+written to the "backtest" section of models/metrics.json.
+
+How to run:
+    python backtest.py --folds 10 --workers 4
+    python backtest.py --window sliding --train-rows 2000 --test-rows 288
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from multiprocessing import Pool
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from features import build_features, feature_names, load_series
+
+# Opened once per worker by _init_worker().
+_X = None
+_y = None
+
+
+def make_folds(n_rows, folds=10, test_rows=288, window="expanding", train_rows=None):
+    """
+    Return (train_start, train_end, test_end) row ranges for each fold.
+
+    Cutoffs are spaced evenly so the last fold's test block ends at the
+    last row. The first fold always has at least `train_rows` (or half the
+    data, if not given) rows to train on.
+    """
+    min_train = train_rows or n_rows // 2
+    last_cutoff = n_rows - test_rows
+    if last_cutoff < min_train:
+        raise ValueError(f"{n_rows} rows is too few for {min_train} train + {test_rows} test rows")
+
+    cutoffs = np.unique(np.linspace(min_train, last_cutoff, folds).astype(int))
+    result = []
+    for cutoff in cutoffs:
+        start = 0 if window == "expanding" else max(0, cutoff - min_train)
+        result.append((int(start), int(cutoff), int(cutoff + test_rows)))
+    return result
+
+
+def _init_worker(arrays_dir):
+    global _X, _y
+    _X = np.load(os.path.join(arrays_dir, "X.npy"), mmap_mode="r")
+    _y = np.load(os.path.join(arrays_dir, "y.npy"), mmap_mode="r")
+
+
+def _run_fold(job):
+    fold, (train_start, train_end, test_end), n_estimators, seed = job
+    model = RandomForestRegressor(n_estimators=n_estimators, random_state=seed, n_jobs=1)
+
+    start = time.perf_counter()
+    model.fit(_X[train_start:train_end], _y[train_start:train_end])
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    preds = model.predict(_X[train_end:test_end])
+    predict_seconds = time.perf_counter() - start
+
+    err = preds - _y[train_end:test_end]
+    return {
+        "fold": fold,
+        "train_rows": train_end - train_start,
+        "test_rows": test_end - train_end,
+        "train_range": [train_start, train_end],
+        "test_range": [train_end, test_end],
+        "mae": float(np.abs(err).mean()),
+        "rmse": float(np.sqrt((err * err).mean())),
+        "fit_seconds": round(fit_seconds, 3),
+        "predict_seconds": round(predict_seconds, 4),
+    }
+
+
+def run_backtest(X, y, folds, workers=1, n_estimators=300, seed=42):
+    """
+    Evaluate every fold, in parallel when workers > 1. Returns fold results.
+    """
+    with tempfile.TemporaryDirectory(prefix="smart_temp_backtest_") as arrays_dir:
+        np.save(os.path.join(arrays_dir, "X.npy"), np.ascontiguousarray(X, dtype=np.float32))
+        np.save(os.path.join(arrays_dir, "y.npy"), np.asarray(y, dtype=np.float64))
+
+        jobs = [(i + 1, fold, n_estimators, seed) for i, fold in enumerate(folds)]
+        if workers > 1:
+            with Pool(processes=workers, initializer=_init_worker, initargs=(arrays_dir,)) as pool:
+                results = list(pool.imap_unordered(_run_fold, jobs))
+        else:
+            _init_worker(arrays_dir)
+            results = [_run_fold(job) for job in jobs]
+
+    return sorted(results, key=lambda r: r["fold"])
+
+
+def summarize(results):
+    maes = np.array([r["mae"] for r in results])
+    rmses = np.array([r["rmse"] for r in results])
+    return {
+        "mae_mean": float(maes.mean()),
+        "mae_std": float(maes.std()),
+        "rmse_mean": float(rmses.mean()),
+        "rmse_std": float(rmses.std()),
+        "fit_seconds_total": round(sum(r["fit_seconds"] for r in results), 3),
+    }
+
+
+def save_backtest(metrics_path, backtest):
+    """
+    Store the backtest under the "backtest" key of metrics.json, keeping
+    whatever train.py wrote there.
+    """
+    metrics = {}
+    if os.path.exists(metrics_path):
+        with open(metrics_path, "r", encoding="utf-8") as f:
+            metrics = json.load(f)
+    metrics["backtest"] = backtest
+    with open(metrics_path, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the temperature model.")
+    parser.add_argument("--data", default="../data/smart_temp_generated.csv")
+    parser.add_argument("--folds", type=int, default=10)
+    parser.add_argument("--test-rows", type=int, default=288,
+                        help="readings per test block (default: 288, one day of 5-minute readings)")
+    parser.add_argument("--window", choices=["expanding", "sliding"], default="expanding")
+    parser.add_argument("--train-rows", type=int, default=None,
+                        help="training rows for the first fold (and every fold with --window sliding)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--n-estimators", type=int, default=300)
+    parser.add_argument("--metrics", default="../models/metrics.json")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        timestamps, temps = load_series(args.data)
+    except FileNotFoundError:
+        timestamps, temps = load_series("../data/smart_temp_sample.csv")
+
+    X, valid = build_features(timestamps, temps)
+    y = temps[valid]
+    folds = make_folds(len(X), args.folds, args.test_rows, args.window, args.train_rows)
+
+    start = time.perf_counter()
+    results = run_backtest(X, y, folds, workers=args.workers, n_estimators=args.n_estimators)
+    elapsed = time.perf_counter() - start
+
+    backtest = {
+        "model": "RandomForestRegressor",
+        "n_estimators": args.n_estimators,
+        "window": args.window,
+        "test_rows": args.test_rows,
+        "workers": args.workers,
+        "wall_seconds": round(elapsed, 2),
+        "features": feature_names(),
+        "summary": summarize(results),
+        "folds": results,
+    }
+    save_backtest(args.metrics, backtest)
+
+    for r in results:
+        print(f"fold {r['fold']:>2}: train {r['train_rows']:>6} rows  "
+              f"MAE {r['mae']:.4f}  RMSE {r['rmse']:.4f}  fit {r['fit_seconds']:.2f}s")
+    s = backtest["summary"]
+    print(f"MAE {s['mae_mean']:.4f} +/- {s['mae_std']:.4f}   RMSE {s['rmse_mean']:.4f} +/- {s['rmse_std']:.4f}")
+    print(f"{len(results)} folds in {elapsed:.2f}s with {args.workers} workers")
+    print("Saved backtest to", args.metrics)
+
+
+if __name__ == "__main__":
+    main()
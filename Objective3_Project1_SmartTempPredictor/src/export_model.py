@@ -0,0 +1,303 @@
+"""
+Objective 3 - Project 1: Smart Temperature Predictor (lightweight export)
+
+The trained 300-tree RandomForestRegressor is slow to load with joblib and
+needs scikit-learn installed. For edge / IoT devices this module:
+
+1. EXPORTS the forest as a handful of flat NumPy node arrays in one .npz
+   file (child ids, split feature, split threshold, leaf value). Those are
+   all the model needs at inference time.
+2. Predicts with a VECTORIZED traversal: every (row, tree) pair moves one
+   level down per step, all at once, so there is no Python loop over trees
+   or nodes. Only NumPy is needed.
+3. Optionally DISTILLS the forest into a much smaller student model (a
+   linear model or a small gradient-boosted tree ensemble) trained to copy
+   the forest's predictions. Students export to the same .npz format.
+
+Thresholds are stored as float32 rounded DOWN, and features are compared as
+float32 (as scikit-learn does), so every split goes the same way as in
+scikit-learn. Leaf values are float32, so predictions agree to ~1e-6 C.
+
+Importing this module needs only NumPy; joblib, pandas and scikit-learn
+are imported inside the export / distill / benchmark functions.
+
+How to run:
+    python export_model.py                       # ../models/smart_temp_model.npz
+    python export_model.py --distill gbdt        # also a small student model
+    python export_model.py --benchmark
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+MODEL_PATH = "../models/smart_temp_model.joblib"
+EXPORT_PATH = "../models/smart_temp_model.npz"
+
+
+class NumpyTreeModel:
+    """
+    Tree ensemble stored as flat node arrays:
+        prediction = bias + scale * sum of each tree's leaf value
+
+    A random forest has scale = 1 / n_trees (the average). Gradient boosting
+    has bias = the initial prediction and scale = the learning rate.
+    Leaves point to themselves with an infinite threshold, so a traversal
+    can run a fixed number of steps and the finished trees just stay put.
+    """
+
+    def __init__(self, arrays):
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.depth = int(arrays["depth"])
+        self.bias = float(arrays["bias"])
+        self.scale = float(arrays["scale"])
+        self.feature_names = [str(name) for name in arrays["feature_names"]]
+
+    @classmethod
+    def from_sklearn(cls, model, trees, bias, scale):
+        left, right, feature, threshold, value, roots = [], [], [], [], [], []
+        offset, depth = 0, 0
+        for tree in trees:
+            t = tree.tree_
+            n = t.node_count
+            ids = np.arange(offset, offset + n, dtype=np.int32)
+            is_leaf = t.children_left < 0
+
+            left.append(np.where(is_leaf, ids, t.children_left + offset).astype(np.int32))
+            right.append(np.where(is_leaf, ids, t.children_right + offset).astype(np.int32))
+            feature.append(np.where(is_leaf, 0, t.feature).astype(np.int16))
+
+            # Largest float32 <= threshold: for float32 inputs, x <= this
+            # is exactly x <= the original float64 threshold.
+            thr = t.threshold.astype(np.float32)
+            too_big = thr.astype(np.float64) > t.threshold
+            thr[too_big] = np.nextafter(thr[too_big], np.float32(-np.inf))
+            thr[is_leaf] = np.inf
+            threshold.append(thr)
+
+            value.append(t.value[:, 0, 0].astype(np.float32))
+            roots.append(offset)
+            offset += n
+            depth = max(depth, t.max_depth)
+
+        return cls({
+            "left": np.concatenate(left), "right": np.concatenate(right),
+            "feature": np.concatenate(feature), "threshold": np.concatenate(threshold),
+            "value": np.concatenate(value), "roots": np.array(roots, dtype=np.int32),
+            "depth": depth, "bias": bias, "scale": scale,
+            "feature_names": np.array(_model_feature_names(model)),
+        })
+
+    def save(self, path):
+        np.savez(
+            path, kind="trees",
+            left=self.left, right=self.right, feature=self.feature,
+            threshold=self.threshold, value=self.value, roots=self.roots,
+            depth=self.depth, bias=self.bias, scale=self.scale,
+            feature_names=np.array(self.feature_names),
+        )
+
+    def predict(self, X, chunk_rows=4096):
+        X = np.asarray(X, dtype=np.float32)
+        out = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), chunk_rows):
+            block = X[start:start + chunk_rows]
+            rows = np.arange(len(block))[:, None]
+            # One node per (row, tree); all of them step down together.
+            node = np.broadcast_to(self.roots, (len(block), len(self.roots)))
+            for _ in range(self.depth):
+                go_left = block[rows, self.feature[node]] <= self.threshold[node]
+                node = np.where(go_left, self.left[node], self.right[node])
+            leaf_sum = self.value[node].sum(axis=1, dtype=np.float64)
+            out[start:start + chunk_rows] = self.bias + self.scale * leaf_sum
+        return out
+
+
+def _model_feature_names(model):
+    names = getattr(model, "feature_names_in_", None)
+    if names is None:
+        from features import feature_names
+        names = feature_names()
+    return [str(name) for name in names]
+
+
+def _frame(model, X):
+    # scikit-learn wants the same column names it was trained with
+    import pandas as pd
+    return pd.DataFrame(X, columns=_model_feature_names(model))
+
+
+class NumpyLinearModel:
+    """
+    Linear student model: prediction = X @ coef + intercept.
+    """
+
+    def __init__(self, arrays):
+        self.coef = arrays["coef"]
+        self.intercept = float(arrays["intercept"])
+        self.feature_names = [str(name) for name in arrays["feature_names"]]
+
+    def save(self, path):
+        np.savez(path, kind="linear", coef=self.coef, intercept=self.intercept,
+                 feature_names=np.array(self.feature_names))
+
+    def predict(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef + self.intercept
+
+
+def export_forest(model):
+    return NumpyTreeModel.from_sklearn(model, model.estimators_, bias=0.0,
+                                       scale=1.0 / len(model.estimators_))
+
+
+def load_numpy_model(path=EXPORT_PATH):
+    """
+    Load an exported model. Needs only NumPy.
+    """
+    with np.load(path) as arrays:
+        data = {key: arrays[key] for key in arrays.files}
+    if str(data["kind"]) == "linear":
+        return NumpyLinearModel(data)
+    return NumpyTreeModel(data)
+
+
+def load_model(path):
+    """
+    Load either an exported .npz model or a joblib scikit-learn model.
+    """
+    if path.endswith(".npz"):
+        return load_numpy_model(path)
+    import joblib
+    return joblib.load(path)
+
+
+def distill(teacher, X, kind="gbdt"):
+    """
+    Train a small student model on the teacher's own predictions.
+
+    The student copies the forest instead of the noisy readings, so it can
+    be far smaller and still track the forest closely.
+    """
+    targets = teacher.predict(_frame(teacher, X))
+    names = _model_feature_names(teacher)
+
+    if kind == "linear":
+        from sklearn.linear_model import Ridge
+        student = Ridge(alpha=1e-3).fit(X, targets)
+        return NumpyLinearModel({
+            "coef": student.coef_.astype(np.float64),
+            "intercept": student.intercept_,
+            "feature_names": np.array(names),
+        })
+
+    from sklearn.ensemble import GradientBoostingRegressor
+    student = GradientBoostingRegressor(n_estimators=200, max_depth=4, learning_rate=0.1,
+                                        random_state=42).fit(X, targets)
+    init = float(student.init_.constant_.ravel()[0])
+    return NumpyTreeModel.from_sklearn(student, student.estimators_[:, 0],
+                                       bias=init, scale=student.learning_rate)
+
+
+def measure_load(load, path, repeats=5):
+    """
+    (median load seconds, peak memory MB while loading) for one model file.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load(path)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    model = load(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return model, float(np.median(times)), peak / 1e6
+
+
+def measure_latency(model, row, repeats=200):
+    """
+    Median seconds for one single-row prediction.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(row)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def run_benchmark(paths, X):
+    print(f"{'model':<28}{'file MB':>9}{'load ms':>10}{'load MB':>10}{'1-row ms':>10}{'max diff':>10}")
+    print("-" * 77)
+    reference = None
+    for label, path in paths:
+        model, load_s, load_mb = measure_load(load_model, path)
+        if path.endswith(".joblib"):
+            batch = _frame(model, X)
+            row = batch.iloc[-1:]
+        else:
+            batch, row = X, X[-1:]
+        preds = model.predict(batch)
+        if reference is None:
+            reference = preds
+        latency = measure_latency(model, row)
+        print(f"{label:<28}{os.path.getsize(path) / 1e6:>9.2f}{load_s * 1000:>10.1f}"
+              f"{load_mb:>10.2f}{latency * 1000:>10.3f}{np.abs(preds - reference).max():>10.4f}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export the forest to NumPy arrays (and optionally distill it).")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--out", default=EXPORT_PATH)
+    parser.add_argument("--distill", choices=["linear", "gbdt"],
+                        help="also train and export a small student model")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="compare load time, memory and single-row latency")
+    parser.add_argument("--data", default="../data/smart_temp_generated.csv",
+                        help="readings used for distillation and the benchmark")
+    return parser.parse_args()
+
+
+def main():
+    import joblib
+    from features import build_features, load_series
+
+    args = parse_args()
+    forest = joblib.load(args.model)
+
+    exported = export_forest(forest)
+    exported.save(args.out)
+    print(f"Exported {len(exported.roots)} trees ({len(exported.value)} nodes) to {args.out}")
+
+    X = None
+    if args.distill or args.benchmark:
+        timestamps, temps = load_series(args.data)
+        X, valid = build_features(timestamps, temps)
+
+    paths = [("RandomForest (joblib)", args.model), ("RandomForest (NumPy)", args.out)]
+    if args.distill:
+        student_path = args.out.replace(".npz", f"_{args.distill}.npz")
+        student = distill(forest, X, kind=args.distill)
+        student.save(student_path)
+        y = temps[valid]
+        mae = float(np.abs(student.predict(X) - y).mean())
+        teacher_mae = float(np.abs(forest.predict(_frame(forest, X)) - y).mean())
+        print(f"Saved {args.distill} student to {student_path} "
+              f"(MAE {mae:.4f} C vs forest {teacher_mae:.4f} C on all rows)")
+        paths.append((f"Student {args.distill} (NumPy)", student_path))
+
+    if args.benchmark:
+        run_benchmark(paths, X)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Objective 3 - Project 1: Smart Temperature Predictor (feature engine)
+
+NumPy version of the lag / rolling-window features in train.py.
+
+The pandas version copies the DataFrame, re-parses the timestamps and adds
+every feature as a separate column. Here the whole feature matrix is
+written into ONE preallocated float64 array (the pandas dtype, so the
+values match it to rounding error, not just float32 precision):
+- lags come from a strided sliding-window view of the series (no copies)
+- rolling means / standard deviations come from cumulative sums, so each
+  window size costs the same no matter how wide it is
+- hour and day of week are integer arithmetic on datetime64 values
+
+Features for row t only need the previous max(lag, window - 1) readings,
+so TAIL mode builds the last K rows from just the last K + that many
+samples. Prediction cost then no longer depends on how long the history is.
+
+Columns are identical (names, order and values) to make_lag_features(),
+so models trained with either can use either. Missing readings (NaN) drop
+the same rows as its dropna(); check_parity() compares the two on a
+series with gaps.
+"""
+
+import io
+import os
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+DEFAULT_LAGS = (1, 2, 3, 6, 12)
+DEFAULT_ROLLING = (3, 6, 12)
+
+_NS_PER_HOUR = 3600 * 10**9
+# 1970-01-01 was a Thursday (Monday = 0, like pandas' dt.dayofweek).
+_EPOCH_DAYOFWEEK = 3
+
+
+def feature_names(lags=DEFAULT_LAGS, rolling=DEFAULT_ROLLING):
+    names = ["hour", "dayofweek"]
+    names += [f"lag_{lag}" for lag in lags]
+    for w in rolling:
+        names += [f"roll_mean_{w}", f"roll_std_{w}"]
+    return names
+
+
+def history_needed(lags=DEFAULT_LAGS, rolling=DEFAULT_ROLLING):
+    """
+    Number of earlier readings a row needs before all its features exist.
+    """
+    return max(max(lags), max(rolling) - 1)
+
+
+def to_datetime64(values):
+    """
+    Timestamps as datetime64[ns], parsing strings only when needed.
+    """
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]")
+    return pd.to_datetime(values).to_numpy(dtype="datetime64[ns]")
+
+
+def load_series(path):
+    """
+    Read a timestamp,temp_c CSV into (timestamps, temps) arrays, sorted by time.
+    """
+    df = pd.read_csv(path, usecols=["timestamp", "temp_c"])
+    return sort_series(to_datetime64(df["timestamp"]), df["temp_c"].to_numpy(dtype=np.float64))
+
+
+def sort_series(timestamps, temps):
+    # Sensor logs are almost always already in order; skip the sort then.
+    if len(timestamps) > 1 and (np.diff(timestamps.view(np.int64)) < 0).any():
+        order = np.argsort(timestamps, kind="stable")
+        timestamps, temps = timestamps[order], temps[order]
+    return timestamps, temps
+
+
+def read_tail(path, n_rows, block_size=1 << 16):
+    """
+    Read only the last n_rows readings of a timestamp,temp_c CSV.
+
+    The file is read backwards in blocks until enough lines are found, so
+    the cost depends on n_rows, not on the size of the file.
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        data_start = f.tell()
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+
+        tail = b""
+        # One extra line, because the first one found may be cut off.
+        while pos > data_start and tail.count(b"\n") <= n_rows + 1:
+            step = min(block_size, pos - data_start)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+
+    lines = tail.splitlines()
+    if pos > data_start:
+        lines = lines[1:]
+    lines = [line for line in lines if line.strip()][-n_rows:]
+
+    df = pd.read_csv(io.BytesIO(header + b"\n".join(lines)), usecols=["timestamp", "temp_c"])
+    return sort_series(to_datetime64(df["timestamp"]), df["temp_c"].to_numpy(dtype=np.float64))
+
+
+def iter_frames(path, chunk_rows=200_000, columns=None):
+    """
+    Yield DataFrame chunks from a CSV file, or from every part file in a
+    folder (sorted by name, which is time order for make_data.py output).
+    `columns` limits the columns that are read.
+    """
+    if not os.path.isdir(path):
+        yield from pd.read_csv(path, chunksize=chunk_rows, usecols=columns)
+        return
+
+    for name in sorted(os.listdir(path)):
+        part = os.path.join(path, name)
+        if name.endswith(".parquet"):
+            yield pd.read_parquet(part, columns=columns)
+        elif name.endswith(".csv"):
+            yield from pd.read_csv(part, chunksize=chunk_rows, usecols=columns)
+
+
+def time_features(timestamps):
+    """
+    (hour, dayofweek) integer arrays for datetime64 timestamps.
+    """
+    hours = timestamps.astype("datetime64[ns]").view(np.int64) // _NS_PER_HOUR
+    return hours % 24, (hours // 24 + _EPOCH_DAYOFWEEK) % 7
+
+
+def build_features(timestamps, temps, lags=DEFAULT_LAGS, rolling=DEFAULT_ROLLING):
+    """
+    Build the feature matrix for every row that has enough history.
+
+    Returns (X, valid) where X is a float64 array with one row per valid
+    reading and columns in feature_names() order, and `valid` is a boolean
+    mask over the input readings. A reading is valid when it is not NaN
+    and none of its lags or rolling windows touch a NaN or the start of
+    the series: the same rows make_lag_features() keeps after dropna().
+    """
+    temps = np.asarray(temps, dtype=np.float64)
+    need = history_needed(lags, rolling)
+    n = len(temps)
+    valid = np.zeros(n, dtype=bool)
+    rows = max(n - need, 0)
+
+    X = np.empty((rows, 2 + len(lags) + 2 * len(rolling)), dtype=np.float64)
+    if rows == 0:
+        return X, valid
+
+    hour, dayofweek = time_features(to_datetime64(timestamps[need:]))
+    X[:, 0] = hour
+    X[:, 1] = dayofweek
+
+    # windows[j] = temps[j : j + need + 1]; its last element is row j + need,
+    # so lag L sits at position need - L. One gather fills every lag column
+    # (a missing reading gives a NaN lag, like shift()).
+    windows = sliding_window_view(temps, need + 1)
+    X[:, 2:2 + len(lags)] = windows[:, [need - lag for lag in lags]]
+
+    # Cumulative sums of the centered series, with missing readings counted
+    # separately. Centering keeps the sum-of-squares variance formula
+    # accurate on long histories.
+    missing = np.isnan(temps)
+    offset = np.nanmean(temps) if not missing.all() else 0.0
+    centered = np.where(missing, 0.0, temps - offset)
+    csum = np.concatenate(([0.0], np.cumsum(centered)))
+    csq = np.concatenate(([0.0], np.cumsum(centered * centered)))
+    cmiss = np.concatenate(([0], np.cumsum(missing)))
+    end = np.arange(need + 1, n + 1)
+
+    col = 2 + len(lags)
+    for w in rolling:
+        total = csum[end] - csum[end - w]
+        mean = total / w
+        # rolling(w) is NaN as soon as one reading in the window is missing.
+        gap = cmiss[end] - cmiss[end - w] > 0
+        X[:, col] = np.where(gap, np.nan, mean + offset)
+        if w > 1:
+            var = (csq[end] - csq[end - w] - total * mean) / (w - 1)
+            X[:, col + 1] = np.where(gap, np.nan, np.sqrt(np.maximum(var, 0.0)))
+        else:
+            X[:, col + 1] = np.nan  # pandas' sample std of one value
+        col += 2
+
+    keep = ~np.isnan(X).any(axis=1) & ~missing[need:]
+    valid[need:] = keep
+    if not keep.all():
+        X = X[keep]
+    return X, valid
+
+
+def window_features(windows, timestamps, lags=DEFAULT_LAGS, rolling=DEFAULT_ROLLING):
+    """
+    Latest feature row for MANY series at once.
+
+    windows[i] holds the most recent readings of series i, oldest first
+    (at least history_needed() + 1 of them), and timestamps[i] is the time
+    of its last reading. Row i is the row build_features() would give for
+    that reading.
+    """
+    windows = np.asarray(windows, dtype=np.float64)
+    X = np.empty((len(windows), 2 + len(lags) + 2 * len(rolling)), dtype=np.float64)
+
+    hour, dayofweek = time_features(to_datetime64(timestamps))
+    X[:, 0] = hour
+    X[:, 1] = dayofweek
+    X[:, 2:2 + len(lags)] = windows[:, [-1 - lag for lag in lags]]
+
+    col = 2 + len(lags)
+    for w in rolling:
+        block = windows[:, -w:]
+        X[:, col] = block.mean(axis=1)
+        X[:, col + 1] = block.std(axis=1, ddof=1) if w > 1 else np.nan
+        col += 2
+
+    return X
+
+
+def tail_features(timestamps, temps, k=1, lags=DEFAULT_LAGS, rolling=DEFAULT_ROLLING):
+    """
+    Feature rows for only the last k readings (fewer if some of them
+    touch a missing reading).
+
+    Uses just the last k + history_needed() samples, so the cost is the
+    same for a day of history or a year of it.
+    """
+    start = max(len(temps) - k - history_needed(lags, rolling), 0)
+    X, _ = build_features(timestamps[start:], temps[start:], lags, rolling)
+    return X
+
+
+def check_parity(path="../data/smart_temp_generated.csv", missing_frac=0.01, seed=0):
+    """
+    Compare build_features() with make_lag_features() on the CSV after
+    blanking out a fraction of the readings. Returns the largest
+    difference (raises if the kept rows differ).
+    """
+    from train import make_lag_features
+
+    df = pd.read_csv(path)
+    rng = np.random.default_rng(seed)
+    df.loc[rng.random(len(df)) < missing_frac, "temp_c"] = np.nan
+
+    expected = make_lag_features(df)
+    timestamps, temps = sort_series(to_datetime64(df["timestamp"]), df["temp_c"].to_numpy(dtype=np.float64))
+    X, valid = build_features(timestamps, temps)
+
+    if len(X) != len(expected) or not np.array_equal(temps[valid], expected["temp_c"].to_numpy()):
+        raise AssertionError(f"kept {len(X)} rows, make_lag_features() kept {len(expected)}")
+    return float(np.abs(X - expected[feature_names()].to_numpy(dtype=np.float64)).max())
+
+
+if __name__ == "__main__":
+    for frac in (0.0, 0.01, 0.05):
+        try:
+            diff = check_parity(missing_frac=frac)
+        except FileNotFoundError:
+            diff = check_parity("../data/smart_temp_sample.csv", missing_frac=frac)
+        print(f"missing {frac:.0%}: features match make_lag_features() (max diff {diff:.2e})")
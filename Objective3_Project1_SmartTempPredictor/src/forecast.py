@@ -0,0 +1,205 @@
+"""
+Objective 3 - Project 1: Smart Temperature Predictor (batch forecasting)
+
+Forecasts the next H readings for MANY sensors at once.
+
+Forecasts are RECURSIVE: like predict.py, the model turns the latest
+feature row into the next reading. That prediction is appended to the
+series and the next step repeats the process. Step 1 is exactly what
+predict.py prints.
+
+Every sensor moves through the steps together. Each step builds one feature
+row per sensor in a single vectorized pass (window_features) and makes ONE
+model.predict call for all sensors, so the model is called H times per run
+no matter how many rooms there are.
+
+Input is a CSV with sensor_id,timestamp,temp_c rows (a CSV without a
+sensor_id column is treated as one sensor), or a folder of part files
+from make_data.py --sensors. It is read in chunks, keeping only each
+sensor's latest readings. Output is a long, columnar
+table (sensor_id, step, timestamp, temp_c_pred) written as Parquet, .npz
+or CSV, depending on the file extension.
+
+How to run:
+    python forecast.py --data ../data/sensors.csv --horizon 12 --out ../models/forecasts.parquet
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from export_model import load_model
+from features import (DEFAULT_LAGS, DEFAULT_ROLLING, feature_names, history_needed,
+                      iter_frames, to_datetime64, window_features)
+
+DEFAULT_STEP = np.timedelta64(5, "m")
+
+
+def _last_rows(codes, n_groups, width):
+    """
+    For rows sorted by group: a mask of the rows that are among the last
+    `width` of their group, plus each group's end position and row count.
+    """
+    groups = np.arange(n_groups)
+    ends = np.searchsorted(codes, groups, side="right")
+    counts = ends - np.searchsorted(codes, groups, side="left")
+    from_end = ends[codes] - 1 - np.arange(len(codes))
+    return from_end < width, ends, counts
+
+
+def load_sensor_windows(path, width, chunk_rows=200_000):
+    """
+    Read every sensor's last `width` readings from a long CSV, or from a
+    folder of part files (make_data.py --sensors).
+
+    The input is streamed in chunks and only each sensor's latest `width`
+    readings are carried from one chunk to the next, so memory depends on
+    the number of sensors, not on the length of the history.
+
+    Returns (sensor_ids, windows, timestamps, skipped, incomplete):
+    windows is a (sensors, width) array of readings (oldest first),
+    timestamps the matching datetime64 values. Sensors with fewer than
+    `width` readings are left out and listed in `skipped`; sensors whose
+    latest readings include a missing (NaN) one are left out and listed in
+    `incomplete`, because their features cannot be built (see predict.py).
+    """
+    tail = None  # (sensor ids, timestamps, temps) of each sensor's latest readings
+    for chunk in iter_frames(path, chunk_rows):
+        if "sensor_id" not in chunk.columns:
+            chunk["sensor_id"] = "sensor_0"
+        columns = (chunk["sensor_id"].to_numpy(), to_datetime64(chunk["timestamp"]),
+                   chunk["temp_c"].to_numpy(dtype=np.float64))
+        if tail is not None:
+            columns = [np.concatenate(pair) for pair in zip(tail, columns)]
+        ids, timestamps, temps = columns
+
+        # Group rows by sensor (first appearance order), in time order within each.
+        codes, sensor_ids = pd.factorize(ids)
+        order = np.lexsort((timestamps, codes))
+        keep, _, _ = _last_rows(codes[order], len(sensor_ids), width)
+        rows = order[keep]
+        tail = (ids[rows], timestamps[rows], temps[rows])
+
+    if tail is None:
+        raise ValueError(f"{path} has no readings")
+    tail_ids, tail_times, tail_temps = tail
+    codes, sensor_ids = pd.factorize(tail_ids)
+    _, ends, counts = _last_rows(codes, len(sensor_ids), width)
+    long_enough = counts >= width
+
+    rows = ends[long_enough, None] - width + np.arange(width)
+    sensor_ids = np.asarray(sensor_ids)
+    windows, timestamps = tail_temps[rows], tail_times[rows]
+    complete = np.isfinite(windows).all(axis=1)
+    return (sensor_ids[long_enough][complete], windows[complete], timestamps[complete],
+            sensor_ids[~long_enough].tolist(), sensor_ids[long_enough][~complete].tolist())
+
+
+def forecast(model, windows, timestamps, horizon=12, lags=DEFAULT_LAGS, rolling=DEFAULT_ROLLING):
+    """
+    Recursive H-step forecast for many sensors.
+
+    windows / timestamps are (sensors, width) arrays of the latest readings
+    with width >= history_needed() + 1. The step size of each sensor is the
+    gap between its last two readings (5 minutes if unknown).
+
+    Returns (predictions, forecast_times), both (sensors, horizon).
+    """
+    sensors, width = windows.shape
+    if width < history_needed(lags, rolling) + 1:
+        raise ValueError(f"need at least {history_needed(lags, rolling) + 1} readings per sensor")
+    if not np.isfinite(windows).all():
+        raise ValueError("windows contain missing (NaN) readings; drop those sensors first")
+
+    last = timestamps[:, -1]
+    step = timestamps[:, -1] - timestamps[:, -2] if width > 1 else np.full(sensors, DEFAULT_STEP)
+    step = np.where(step > np.timedelta64(0, "ns"), step, DEFAULT_STEP).astype("timedelta64[ns]")
+
+    # One buffer per run: real readings followed by the predictions so far.
+    buffer = np.empty((sensors, width + horizon), dtype=np.float64)
+    buffer[:, :width] = windows
+    names = feature_names(lags, rolling)
+
+    for h in range(horizon):
+        X = window_features(buffer[:, h:width + h], last + h * step, lags, rolling)
+        buffer[:, width + h] = model.predict(pd.DataFrame(X, columns=names))
+
+    forecast_times = last[:, None] + step[:, None] * np.arange(1, horizon + 1)
+    return buffer[:, width:], forecast_times
+
+
+def forecasts_to_frame(sensor_ids, predictions, forecast_times):
+    """
+    Long table with one row per (sensor, step).
+    """
+    sensors, horizon = predictions.shape
+    return pd.DataFrame({
+        "sensor_id": np.repeat(sensor_ids, horizon),
+        "step": np.tile(np.arange(1, horizon + 1, dtype=np.int16), sensors),
+        "timestamp": forecast_times.ravel(),
+        "temp_c_pred": predictions.ravel().astype(np.float32),
+    })
+
+
+def write_forecasts(frame, out_path):
+    """
+    Write forecasts as Parquet (.parquet), NumPy columns (.npz) or CSV.
+    """
+    if out_path.endswith(".parquet"):
+        # Needs pyarrow (or fastparquet); see requirements.txt.
+        frame.to_parquet(out_path, index=False)
+    elif out_path.endswith(".npz"):
+        np.savez(out_path, **{col: frame[col].to_numpy() for col in frame.columns})
+    else:
+        frame.to_csv(out_path, index=False)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Forecast the next readings for many sensors at once.")
+    parser.add_argument("--data", default="../data/smart_temp_generated.csv",
+                        help="CSV of sensor_id,timestamp,temp_c rows (sensor_id optional), "
+                             "or a folder of part files from make_data.py --sensors")
+    parser.add_argument("--chunk-rows", type=int, default=200_000,
+                        help="CSV rows read per chunk (default: 200000)")
+    parser.add_argument("--model", default="../models/smart_temp_model.joblib",
+                        help="joblib model, or a NumPy export from export_model.py (.npz)")
+    parser.add_argument("--horizon", type=int, default=12,
+                        help="number of steps to forecast (default: 12, one hour of 5-minute readings)")
+    parser.add_argument("--out", default="../models/forecasts.parquet",
+                        help="output file: .parquet, .npz or .csv")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    model = load_model(args.model)
+
+    width = history_needed() + 1
+    sensor_ids, windows, timestamps, skipped, incomplete = load_sensor_windows(
+        args.data, width, chunk_rows=args.chunk_rows)
+    if skipped:
+        print(f"Skipped {len(skipped)} sensors with fewer than {width} readings", file=sys.stderr)
+    if incomplete:
+        shown = ", ".join(map(str, incomplete[:10])) + (", ..." if len(incomplete) > 10 else "")
+        print(f"Skipped {len(incomplete)} sensors with missing readings in their last {width}: {shown}",
+              file=sys.stderr)
+    if not len(sensor_ids):
+        raise SystemExit("No sensor has enough complete recent readings to forecast.")
+
+    start = time.perf_counter()
+    predictions, forecast_times = forecast(model, windows, timestamps, horizon=args.horizon)
+    elapsed = time.perf_counter() - start
+
+    frame = forecasts_to_frame(sensor_ids, predictions, forecast_times)
+    write_forecasts(frame, args.out)
+
+    print(f"Forecast {len(sensor_ids)} sensors x {args.horizon} steps in {elapsed:.2f}s")
+    print("Saved forecasts to", args.out)
+    print(frame.head(args.horizon).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
+import argparse
+import os
+import time
+
 import numpy as np
 import pandas as pd
 
-def main():
+def write_single_sensor():
     # Synthetic time series: daily cycle + noise + small drift
     rng = np.random.default_rng(42)
     start = pd.Timestamp("2025-12-01 00:00:00")
@@ -22,5 +26,125 @@ def main():
     df.to_csv("../data/smart_temp_generated.csv", index=False)
     print("Wrote ../data/smart_temp_generated.csv")
 
+# -----------------------------
+# Many sensors (benchmark datasets)
+# -----------------------------
+# Every sensor gets its own base temperature, daily-cycle amplitude and
+# phase, drift and noise level. Readings are generated for ALL sensors at
+# once, one block of days at a time, and each block goes straight to its
+# own columnar part file (sensor_id, timestamp, temp_c in time order), so
+# memory stays at one block no matter how large the dataset is.
+
+READINGS_PER_DAY = 12 * 24  # 5-minute intervals
+
+def sensor_parameters(n_sensors, seed):
+    rng = np.random.default_rng([seed, 0])
+    return {
+        "base": rng.normal(21.0, 1.5, n_sensors),
+        "amplitude": rng.uniform(1.0, 4.0, n_sensors),
+        "phase": rng.uniform(0, 24 * 60, n_sensors),     # minutes
+        "drift": rng.normal(0.0, 0.05, n_sensors),       # degrees per day
+        "noise": rng.uniform(0.1, 0.4, n_sensors),
+    }
+
+def generate_block(params, start, first_day, days, seed, anomaly_rate=0.0, gap_rate=0.0, gap_length=12):
+    """
+    Readings for every sensor over `days` days starting at day `first_day`.
+
+    Returns a DataFrame in time order (all sensors for one timestamp, then
+    the next timestamp). Anomalies are sudden spikes of 3-8 C; gaps are
+    outages of `gap_length` readings where a sensor reports nothing.
+    """
+    n_sensors = len(params["base"])
+    periods = days * READINGS_PER_DAY
+    rng = np.random.default_rng([seed, first_day + 1])
+
+    minutes = (first_day * READINGS_PER_DAY + np.arange(periods))[:, None] * 5.0
+    temp = (
+        params["base"]
+        + params["amplitude"] * np.sin(2 * np.pi * (minutes + params["phase"]) / (60 * 24))
+        + params["drift"] * (minutes / (60 * 24))
+        + params["noise"] * rng.standard_normal((periods, n_sensors))
+    )
+
+    if anomaly_rate > 0:
+        spikes = rng.random((periods, n_sensors)) < anomaly_rate
+        temp[spikes] += rng.choice([-1.0, 1.0], spikes.sum()) * rng.uniform(3, 8, spikes.sum())
+
+    keep = None
+    if gap_rate > 0:
+        # An outage starts at a reading with probability gap_rate / gap_length,
+        # so roughly gap_rate of all readings end up missing.
+        starts = (rng.random((periods, n_sensors)) < gap_rate / gap_length).cumsum(axis=0)
+        ended = np.zeros_like(starts)
+        ended[gap_length:] = starts[:-gap_length]
+        keep = (starts - ended == 0).ravel()
+
+    times = start + pd.to_timedelta(minutes[:, 0], unit="min")
+    frame = pd.DataFrame({
+        "sensor_id": pd.Categorical.from_codes(
+            np.tile(np.arange(n_sensors, dtype=np.int32), periods),
+            categories=[f"room_{i:05d}" for i in range(n_sensors)],
+        ),
+        "timestamp": np.repeat(times.to_numpy(), n_sensors),
+        "temp_c": np.round(temp.ravel(), 2).astype(np.float32),
+    })
+    if keep is not None:
+        frame = frame[keep].reset_index(drop=True)
+    return frame
+
+def write_part(frame, path, fmt):
+    if fmt == "parquet":
+        # Needs pyarrow; sensor_id is stored dictionary-encoded.
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+
+def write_many_sensors(n_sensors, days, out_dir, fmt="parquet", block_days=1, seed=42,
+                       anomaly_rate=0.0, gap_rate=0.0, start="2025-12-01 00:00:00"):
+    os.makedirs(out_dir, exist_ok=True)
+    params = sensor_parameters(n_sensors, seed)
+    start = pd.Timestamp(start)
+
+    rows = 0
+    began = time.perf_counter()
+    for part, first_day in enumerate(range(0, days, block_days)):
+        block = generate_block(params, start, first_day, min(block_days, days - first_day), seed,
+                               anomaly_rate=anomaly_rate, gap_rate=gap_rate)
+        write_part(block, os.path.join(out_dir, f"part-{part:05d}.{fmt}"), fmt)
+        rows += len(block)
+
+    elapsed = time.perf_counter() - began
+    size_mb = sum(os.path.getsize(os.path.join(out_dir, f)) for f in os.listdir(out_dir)) / 1e6
+    print(f"Wrote {rows:,} readings ({n_sensors} sensors x {days} days) to {out_dir}/ "
+          f"in {elapsed:.1f}s ({size_mb:.0f} MB, {rows / max(elapsed, 1e-9) / 1e6:.1f}M rows/s)")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate synthetic temperature readings.")
+    parser.add_argument("--sensors", type=int, default=None,
+                        help="number of sensors; without it, writes the single-sensor demo CSV")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--out", default="../data/sensors",
+                        help="output folder for the part files (default: ../data/sensors)")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--block-days", type=int, default=1,
+                        help="days per part file (default: 1)")
+    parser.add_argument("--anomaly-rate", type=float, default=0.0,
+                        help="fraction of readings turned into spikes (e.g. 0.001)")
+    parser.add_argument("--gap-rate", type=float, default=0.0,
+                        help="approximate fraction of readings lost to outages (e.g. 0.01)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.sensors is None:
+        write_single_sensor()
+        return
+
+    write_many_sensors(args.sensors, args.days, args.out, fmt=args.format,
+                       block_days=args.block_days, seed=args.seed,
+                       anomaly_rate=args.anomaly_rate, gap_rate=args.gap_rate)
+
 if __name__ == "__main__":
     main()
@@ -1,24 +1,30 @@
-import joblib
+import argparse
 import pandas as pd
-from train import make_lag_features
+from export_model import load_model
+from features import feature_names, history_needed, read_tail, tail_features
 
 def main():
-    model = joblib.load("../models/smart_temp_model.joblib")
+    parser = argparse.ArgumentParser(description="Predict the next temperature reading.")
+    parser.add_argument("--model", default="../models/smart_temp_model.joblib",
+                        help="joblib model, or a NumPy export from export_model.py (.npz)")
+    args = parser.parse_args()
 
-    # Use generated data if available, otherwise sample
+    model = load_model(args.model)
+
+    # Only the last readings are needed for the next prediction, so read
+    # just the end of the file (generated data if available, otherwise sample)
+    needed = history_needed() + 1
     try:
-        df = pd.read_csv("../data/smart_temp_generated.csv")
+        timestamps, temps = read_tail("../data/smart_temp_generated.csv", needed)
     except FileNotFoundError:
-        df = pd.read_csv("../data/smart_temp_sample.csv")
-
-    feat = make_lag_features(df)
-    feature_cols = [c for c in feat.columns if c not in ("timestamp", "temp_c")]
+        timestamps, temps = read_tail("../data/smart_temp_sample.csv", needed)
 
-    last_row = feat.iloc[-1]
-    X = last_row[feature_cols].to_frame().T
+    X = pd.DataFrame(tail_features(timestamps, temps, k=1), columns=feature_names())
+    if X.empty:
+        raise SystemExit("The latest readings have gaps (missing temp_c); cannot build features.")
     pred = model.predict(X)[0]
 
-    print("Last timestamp:", last_row["timestamp"])
+    print("Last timestamp:", pd.Timestamp(timestamps[-1]))
     print("Predicted next temp (approx):", round(float(pred), 2), "C")
 
 if __name__ == "__main__":
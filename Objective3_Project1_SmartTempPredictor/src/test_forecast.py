@@ -0,0 +1,55 @@
+"""
+Regression tests for forecast.py (run: python -m pytest test_forecast.py).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from features import history_needed
+from forecast import forecast, load_sensor_windows
+
+
+class LastReading:
+    """Predicts the previous reading (lag_1), enough to exercise forecast()."""
+
+    def predict(self, X):
+        return X["lag_1"].to_numpy()
+
+
+def write_sensors(path, n_readings=30):
+    times = pd.date_range("2025-12-01", periods=n_readings, freq="5min")
+    rows = []
+    for sensor, base in (("ok", 20.0), ("gap", 21.0), ("old_gap", 22.0)):
+        temps = base + np.arange(n_readings) * 0.01
+        if sensor == "gap":
+            temps[-3] = np.nan  # inside the last window
+        if sensor == "old_gap":
+            temps[2] = np.nan   # long before it
+        rows.append(pd.DataFrame({"sensor_id": sensor, "timestamp": times, "temp_c": temps}))
+    pd.concat(rows).to_csv(path, index=False)
+
+
+def test_sensors_with_missing_recent_readings_are_not_forecast(tmp_path):
+    path = tmp_path / "sensors.csv"
+    write_sensors(path)
+    width = history_needed() + 1
+
+    sensor_ids, windows, timestamps, skipped, incomplete = load_sensor_windows(str(path), width,
+                                                                               chunk_rows=7)
+    assert list(sensor_ids) == ["ok", "old_gap"]
+    assert incomplete == ["gap"]
+    assert skipped == []
+
+    predictions, _ = forecast(LastReading(), windows, timestamps, horizon=3)
+    assert np.isfinite(predictions).all()
+
+
+def test_forecast_refuses_windows_with_missing_readings():
+    width = history_needed() + 1
+    windows = np.full((1, width), 20.0)
+    windows[0, -1] = np.nan
+    timestamps = pd.date_range("2025-12-01", periods=width, freq="5min").to_numpy()[None, :]
+
+    with pytest.raises(ValueError):
+        forecast(LastReading(), windows, timestamps, horizon=2)
@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error, mean_squared_error
+from features import build_features, feature_names, load_series
 
 def make_lag_features(df: pd.DataFrame, lags=(1,2,3,6,12), rolling=(3,6,12)) -> pd.DataFrame:
     df = df.copy()
@@ -35,14 +36,17 @@ def time_split(df: pd.DataFrame, train_frac=0.8):
 def main():
     data_path = "../data/smart_temp_generated.csv"
     try:
-        df = pd.read_csv(data_path)
+        timestamps, temps = load_series(data_path)
     except FileNotFoundError:
-        df = pd.read_csv("../data/smart_temp_sample.csv")
+        timestamps, temps = load_series("../data/smart_temp_sample.csv")
 
-    feat = make_lag_features(df)
+    # Same features as make_lag_features(), built by the NumPy engine
+    X, valid = build_features(timestamps, temps)
+    feature_cols = feature_names()
+    feat = pd.DataFrame(X, columns=feature_cols)
+    feat["temp_c"] = temps[valid]
     train, test = time_split(feat)
 
-    feature_cols = [c for c in feat.columns if c not in ("timestamp", "temp_c")]
     X_train, y_train = train[feature_cols], train["temp_c"]
     X_test, y_test = test[feature_cols], test["temp_c"]
 
@@ -0,0 +1,212 @@
+"""
+Objective 3 - Project 1: Smart Temperature Predictor (out-of-core training)
+
+train.py reads the whole CSV, builds every feature row and fits in memory.
+That stops working for years of 5-minute readings from hundreds of
+sensors. This script never holds more than one chunk:
+
+- The CSV (sensor_id,timestamp,temp_c, in time order; sensor_id optional)
+  is streamed with pd.read_csv(chunksize=...). A folder of part files from
+  make_data.py --sensors (Parquet or CSV) is read one part at a time.
+- Features are built chunk by chunk with the NumPy feature engine. Each
+  sensor CARRIES its last max(lag, window - 1) readings over to the next
+  chunk, so rows right after a chunk boundary get exactly the same lags and
+  rolling stats as if the whole file had been loaded.
+- The model is an incremental regressor (StandardScaler + SGDRegressor,
+  both updated with partial_fit). SGD learns the standardized temperature;
+  the scaling is folded back into its weights at the end, so the saved
+  pipeline predicts degrees C directly, like the forest.
+
+Pass 0 reads only the timestamp column to find the time range. The last
+20% of that range is held out for testing, like time_split(). Pass 1 fits
+the scaler and the target mean / std on the training rows only, so
+nothing about the test period leaks into the model. Then each epoch
+streams the file again and calls partial_fit per chunk. Test rows are
+scored during the last epoch, after the chunk's own training rows have
+been learned. They come after every training row, because the file is in
+time order.
+
+How to run:
+    python train_chunked.py --data ../data/sensors.csv --chunk-rows 200000 --epochs 3
+    python train_chunked.py --data ../data/sensors --epochs 1
+"""
+
+import argparse
+import json
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from features import (DEFAULT_LAGS, DEFAULT_ROLLING, build_features, feature_names,
+                      history_needed, iter_frames, to_datetime64)
+
+
+def iter_feature_chunks(path, chunk_rows=200_000, lags=DEFAULT_LAGS, rolling=DEFAULT_ROLLING):
+    """
+    Stream sensor readings and yield (X, y, timestamps) for each chunk.
+
+    Features for the first readings of a chunk use the readings carried
+    over from the previous chunk of the same sensor.
+    """
+    need = history_needed(lags, rolling)
+    carry = {}  # sensor_id -> (timestamps, temps) of its last `need` readings
+
+    for chunk in iter_frames(path, chunk_rows):
+        if "sensor_id" not in chunk.columns:
+            chunk["sensor_id"] = "sensor_0"
+        all_times = to_datetime64(chunk["timestamp"])
+        all_temps = chunk["temp_c"].to_numpy(dtype=np.float64)
+
+        # Row positions of each sensor, kept in file (time) order.
+        codes, sensors = pd.factorize(chunk["sensor_id"])
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(sensors) + 1))
+
+        X_parts, y_parts, t_parts = [], [], []
+        for i, sensor in enumerate(sensors):
+            rows = order[bounds[i]:bounds[i + 1]]
+            times, temps = all_times[rows], all_temps[rows]
+            if sensor in carry:
+                prev_times, prev_temps = carry[sensor]
+                if times[0] < prev_times[-1]:
+                    raise ValueError(f"{path} is not in time order (sensor {sensor!r} at {times[0]})")
+                times = np.concatenate((prev_times, times))
+                temps = np.concatenate((prev_temps, temps))
+
+            X, valid = build_features(times, temps, lags, rolling)
+            X_parts.append(X)
+            y_parts.append(temps[valid])
+            t_parts.append(times[valid])
+            carry[sensor] = (times[-need:], temps[-need:])
+
+        yield np.concatenate(X_parts), np.concatenate(y_parts), np.concatenate(t_parts)
+
+
+def time_range(path, chunk_rows):
+    """
+    Pass 0: first and last timestamp, reading only the timestamp column.
+    """
+    first = last = None
+    for chunk in iter_frames(path, chunk_rows, columns=["timestamp"]):
+        if not len(chunk):
+            continue
+        times = to_datetime64(chunk["timestamp"])
+        first = times.min() if first is None else min(first, times.min())
+        last = times.max() if last is None else max(last, times.max())
+    return first, last
+
+
+def scan(path, chunk_rows, names, cutoff):
+    """
+    Pass 1: fit the scaler, and find the row count and the mean / standard
+    deviation of the target, all from rows before `cutoff`.
+    """
+    scaler = StandardScaler()
+    rows = 0
+    y_sum = y_sq = 0.0
+    for X, y, times in iter_feature_chunks(path, chunk_rows):
+        is_train = times < cutoff
+        if not is_train.any():
+            continue
+        X, y = X[is_train], y[is_train]
+        scaler.partial_fit(pd.DataFrame(X, columns=names))
+        rows += len(X)
+        y_sum += float(y.sum())
+        y_sq += float((y * y).sum())
+
+    y_mean = y_sum / rows if rows else 0.0
+    y_std = float(np.sqrt(max(y_sq / rows - y_mean ** 2, 0.0))) if rows else 1.0
+    return scaler, rows, y_mean, (y_std or 1.0)
+
+
+def train_chunked(path, chunk_rows=200_000, epochs=3, train_frac=0.8, seed=42):
+    """
+    Train the scaler + SGD pipeline out of core. Returns (model, metrics).
+    """
+    names = feature_names()
+    start = time.perf_counter()
+    first, last = time_range(path, chunk_rows)
+    if first is None:
+        raise ValueError(f"{path} has no rows")
+    cutoff = first + (last - first) * train_frac
+    scaler, rows, y_mean, y_std = scan(path, chunk_rows, names, cutoff)
+    if rows == 0:
+        raise ValueError(f"{path} has no training rows with enough history to build features")
+
+    model = SGDRegressor(learning_rate="adaptive", eta0=0.01, alpha=1e-5, random_state=seed)
+    rng = np.random.default_rng(seed)
+    train_rows = test_rows = 0
+    abs_err = sq_err = 0.0
+
+    for epoch in range(epochs):
+        final = epoch == epochs - 1
+        for X, y, times in iter_feature_chunks(path, chunk_rows):
+            Xs = scaler.transform(pd.DataFrame(X, columns=names))
+            is_train = times < cutoff
+
+            if is_train.any():
+                # Shuffle within the chunk; SGD learns better from mixed rows.
+                order = rng.permutation(np.flatnonzero(is_train))
+                model.partial_fit(Xs[order], (y[order] - y_mean) / y_std)
+                if final:
+                    train_rows += len(order)
+
+            # Scored after the chunk's training rows, which all come first in time.
+            if final and not is_train.all():
+                err = model.predict(Xs[~is_train]) * y_std + y_mean - y[~is_train]
+                abs_err += float(np.abs(err).sum())
+                sq_err += float((err * err).sum())
+                test_rows += int(err.size)
+
+    # Undo the target scaling inside the model itself.
+    model.coef_ *= y_std
+    model.intercept_ = model.intercept_ * y_std + y_mean
+    pipeline = Pipeline([("scaler", scaler), ("model", model)])
+    metrics = {
+        "model": "SGDRegressor (out-of-core)",
+        "mae": abs_err / test_rows if test_rows else None,
+        "rmse": float(np.sqrt(sq_err / test_rows)) if test_rows else None,
+        "train_rows": train_rows,
+        "test_rows": test_rows,
+        "test_from": str(pd.Timestamp(cutoff)),
+        "epochs": epochs,
+        "chunk_rows": chunk_rows,
+        "train_seconds": round(time.perf_counter() - start, 2),
+        "features": names,
+    }
+    return pipeline, metrics
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train on sensor history that does not fit in memory.")
+    parser.add_argument("--data", default="../data/smart_temp_generated.csv",
+                        help="CSV of sensor_id,timestamp,temp_c rows in time order (sensor_id optional), "
+                             "or a folder of part files from make_data.py --sensors")
+    parser.add_argument("--chunk-rows", type=int, default=200_000,
+                        help="CSV rows read per chunk (default: 200000)")
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--model-out", default="../models/smart_temp_model_sgd.joblib")
+    parser.add_argument("--metrics-out", default="../models/metrics_chunked.json")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    model, metrics = train_chunked(args.data, chunk_rows=args.chunk_rows, epochs=args.epochs)
+
+    joblib.dump(model, args.model_out)
+    with open(args.metrics_out, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2)
+
+    print("Saved model to", args.model_out)
+    print("Saved metrics to", args.metrics_out)
+    print({k: v for k, v in metrics.items() if k != "features"})
+
+
+if __name__ == "__main__":
+    main()
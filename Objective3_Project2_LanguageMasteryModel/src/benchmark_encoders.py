@@ -0,0 +1,151 @@
+"""
+Objective 3 - Project 2: Language Mastery Progress Model (encoder benchmark)
+
+Compares the "cat" step of the pipeline (onehot / hash / freq, see
+encoders.py) on synthetic data with many learners. Every user has a
+hidden ability and every word a hidden difficulty, so the user_id and word
+columns actually carry signal.
+
+For each user count and encoder, it reports:
+- fit seconds for the full pipeline (encoder + scaler + LogisticRegression)
+- memory of the encoded matrix (what LogisticRegression sees) per 1M rows
+- size of the saved pipeline
+- median predict_proba latency for one record, and batch throughput
+- ROC AUC on the held-out 20%
+
+How to run:
+    python benchmark_encoders.py --users 10000 1000000 10000000
+    python benchmark_encoders.py --users 10000 --encoders hash freq --rows-per-user 5
+"""
+
+import argparse
+import io
+import json
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.metrics import roc_auc_score
+
+from train import CAT_COLS, NUM_COLS, build_pipeline
+
+
+def make_learners(n_users, rows_per_user=2, n_words=5000, seed=13, test_frac=0.2):
+    """
+    Synthetic attempt rows: (X_train, y_train, X_test, y_test).
+
+    Columns are generated as arrays and split before any DataFrame is
+    built, so the full table never exists twice in memory.
+    """
+    rng = np.random.default_rng(seed)
+    n = n_users * rows_per_user
+    ability = rng.normal(0.0, 0.8, n_users)
+    difficulty = rng.normal(0.0, 0.5, n_words)
+
+    user = rng.integers(0, n_users, n)
+    word = rng.integers(0, n_words, n)
+    columns = {
+        "attempts_total": rng.integers(1, 15, n),
+        "correct_rate": np.clip(rng.normal(0.65, 0.2, n), 0.0, 1.0).round(2),
+        "days_since_last_seen": np.clip(rng.normal(4, 4, n), 0, 30).astype(np.int64),
+        "current_streak": np.clip(rng.normal(2, 2, n), 0, 10).astype(np.int64),
+    }
+    logit = (-1.5 + 3.0 * columns["correct_rate"] + 0.12 * columns["current_streak"]
+             - 0.08 * columns["days_since_last_seen"] + ability[user] - difficulty[word])
+    y = (rng.random(n) < 1.0 / (1.0 + np.exp(-logit))).astype(np.int8)
+
+    user_names = np.array([f"u{i}" for i in range(n_users)], dtype=object)
+    word_names = np.array([f"w{i}" for i in range(n_words)], dtype=object)
+
+    def frame(rows):
+        return pd.DataFrame({
+            "user_id": user_names[user[rows]],
+            "word": word_names[word[rows]],
+            **{name: values[rows] for name, values in columns.items()},
+        }, columns=CAT_COLS + NUM_COLS)
+
+    split = int(n * (1 - test_frac))
+    train, test = slice(0, split), slice(split, n)
+    return frame(train), y[train], frame(test), y[test]
+
+
+def matrix_bytes(M):
+    if sparse.issparse(M):
+        M = M.tocsr()
+        return M.data.nbytes + M.indices.nbytes + M.indptr.nbytes
+    return np.asarray(M).nbytes
+
+
+def bench_encoder(encoder, X_train, y_train, X_test, y_test, hash_features=2 ** 20,
+                  single_calls=200, single_budget=5.0):
+    pipe = build_pipeline(encoder, hash_features)
+
+    start = time.perf_counter()
+    pipe.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    buffer = io.BytesIO()
+    joblib.dump(pipe, buffer)
+
+    start = time.perf_counter()
+    probs = pipe.predict_proba(X_test)[:, 1]
+    batch_seconds = time.perf_counter() - start
+    encoded = pipe.named_steps["pre"].transform(X_test)
+
+    one = X_test.iloc[:1]
+    pipe.predict_proba(one)
+    latencies = []
+    while len(latencies) < single_calls and sum(latencies) < single_budget:
+        start = time.perf_counter()
+        pipe.predict_proba(one)
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "encoder": encoder,
+        "fit_seconds": round(fit_seconds, 2),
+        "columns": int(encoded.shape[1]),
+        "encoded_mb_per_1m_rows": round(matrix_bytes(encoded) / len(X_test), 1),
+        "pipeline_mb": round(buffer.tell() / 1e6, 2),
+        "predict_one_ms": round(float(np.median(latencies)) * 1000, 3),
+        "predict_rows_per_s": int(len(X_test) / batch_seconds),
+        "roc_auc": round(float(roc_auc_score(y_test, probs)), 4),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark categorical encoders for many users.")
+    parser.add_argument("--users", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--encoders", nargs="+", choices=["onehot", "hash", "freq"],
+                        default=["onehot", "hash", "freq"])
+    parser.add_argument("--rows-per-user", type=int, default=2)
+    parser.add_argument("--hash-features", type=int, default=2 ** 20)
+    parser.add_argument("--out", default="../models/encoder_benchmark.json")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = []
+    for n_users in args.users:
+        X_train, y_train, X_test, y_test = make_learners(n_users, args.rows_per_user)
+        rows = len(X_train) + len(X_test)
+        print(f"\n{n_users:,} users, {rows:,} rows")
+
+        for encoder in args.encoders:
+            result = bench_encoder(encoder, X_train, y_train, X_test, y_test, args.hash_features)
+            results.append({"users": n_users, "rows": rows, **result})
+            print(f"  {encoder:<7} fit {result['fit_seconds']:>8.2f}s  "
+                  f"{result['columns']:>10,} cols {result['encoded_mb_per_1m_rows']:>6.1f} MB/1M rows  "
+                  f"saved {result['pipeline_mb']:>7.2f} MB  predict(1) {result['predict_one_ms']:>8.3f} ms  "
+                  f"{result['predict_rows_per_s']:>10,} rows/s  AUC {result['roc_auc']:.4f}")
+
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+
+    print("\nSaved benchmark to", args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Objective 3 - Project 2: Language Mastery Progress Model (categorical encoders)
+
+OneHotEncoder gives every user and every word its own column. With
+millions of learners, that means millions of columns, a large list of
+categories to search on every transform, and a model with one weight per
+user. The two encoders below can replace it as the "cat" step of the
+pipeline (see train.py --encoder):
+
+- HashingEncoder: hashes each value into one of n_features columns (the
+  "hashing trick"). It has nothing to fit and stores nothing, and new
+  users need no refit. Different values can share a column. A random
+  +1/-1 sign keeps those collisions from piling up in one direction.
+
+- FrequencyEncoder: a precomputed lookup table with two numbers per
+  category: log(1 + count) and a smoothed rate of is_correct_next. Two
+  dense columns per input column, whatever the number of users. During
+  training, each row's rate is computed from the OTHER folds only
+  (cross-fitting), so the model cannot read its own label back.
+  Unknown categories get count 0 and the overall rate.
+
+Both are scikit-learn transformers and pickle with the pipeline.
+"""
+
+import hashlib
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.model_selection import KFold
+
+
+def _column_values(X, column):
+    # DataFrames and dicts of arrays are indexed by name, arrays by position.
+    values = X[column] if hasattr(X, "columns") or isinstance(X, Mapping) else X[:, column]
+    return np.asarray(values, dtype=object)
+
+
+def _columns(X):
+    if isinstance(X, Mapping):
+        return list(X)
+    return list(X.columns) if hasattr(X, "columns") else list(range(X.shape[1]))
+
+
+class HashingEncoder(TransformerMixin, BaseEstimator):
+    """
+    Signed feature hashing of categorical columns into a sparse matrix.
+    """
+
+    def __init__(self, n_features=2 ** 20):
+        self.n_features = n_features
+
+    def fit(self, X, y=None):
+        self.columns_ = _columns(X)
+        self.n_features_in_ = len(self.columns_)
+        return self
+
+    def transform(self, X):
+        n_rows = len(_column_values(X, self.columns_[0]))
+        n_cols = len(self.columns_)
+        indices = np.empty((n_rows, n_cols), dtype=np.int32)
+        signs = np.empty((n_rows, n_cols), dtype=np.float64)
+
+        for j, column in enumerate(self.columns_):
+            # A different hash key per column, so user "apple" and word
+            # "apple" land in different places.
+            key = hashlib.md5(str(column).encode("utf-8")).hexdigest()[:16]
+            values = _column_values(X, column)
+            if pd.api.types.infer_dtype(values, skipna=False) != "string":
+                values = values.astype(str).astype(object)
+            h = pd.util.hash_array(values, hash_key=key, categorize=True)
+            indices[:, j] = h % np.uint64(self.n_features)
+            signs[:, j] = np.where(h >> np.uint64(63), -1.0, 1.0)
+
+        indptr = np.arange(0, n_rows * n_cols + 1, n_cols, dtype=np.int64)
+        return sparse.csr_matrix((signs.ravel(), indices.ravel(), indptr),
+                                 shape=(n_rows, self.n_features))
+
+
+class FrequencyEncoder(TransformerMixin, BaseEstimator):
+    """
+    Per-category log count and smoothed target rate, from a lookup table.
+    """
+
+    def __init__(self, smoothing=10.0, cv=5, random_state=0):
+        self.smoothing = smoothing
+        self.cv = cv
+        self.random_state = random_state
+
+    def _rate(self, hits, counts):
+        return (hits + self.smoothing * self.prior_) / (counts + self.smoothing)
+
+    def _lookup(self, table, values):
+        index, log_counts, rates = table
+        pos = index.get_indexer(values)
+        known = pos >= 0
+        out = np.empty((len(values), 2), dtype=np.float64)
+        out[:, 0] = np.where(known, log_counts[pos], 0.0)
+        out[:, 1] = np.where(known, rates[pos], self.prior_)
+        return out
+
+    def _fit(self, X, y):
+        """
+        Build the lookup tables. Returns (codes, counts, hits) per column.
+        """
+        self.columns_ = _columns(X)
+        self.n_features_in_ = len(self.columns_)
+        self.prior_ = float(y.mean())
+        self.tables_, stats = [], []
+        for column in self.columns_:
+            codes, categories = pd.factorize(_column_values(X, column), use_na_sentinel=False)
+            counts = np.bincount(codes, minlength=len(categories)).astype(np.float64)
+            hits = np.bincount(codes, weights=y, minlength=len(categories))
+            self.tables_.append((pd.Index(categories), np.log1p(counts), self._rate(hits, counts)))
+            stats.append((codes, counts, hits))
+        return stats
+
+    def fit(self, X, y):
+        self._fit(X, np.asarray(y, dtype=np.float64))
+        return self
+
+    def fit_transform(self, X, y=None, **fit_params):
+        y = np.asarray(y, dtype=np.float64)
+        stats = self._fit(X, y)
+        out = np.empty((len(y), 2 * len(stats)), dtype=np.float64)
+        folds = None
+        if self.cv and self.cv > 1:
+            kfold = KFold(self.cv, shuffle=True, random_state=self.random_state)
+            folds = [rows for _, rows in kfold.split(y)]
+
+        for j, (codes, counts, hits) in enumerate(stats):
+            out[:, 2 * j] = np.log1p(counts)[codes]
+            if folds is None:
+                out[:, 2 * j + 1] = self._rate(hits, counts)[codes]
+                continue
+            # Out-of-fold rates: the totals minus what the fold itself adds.
+            for rows in folds:
+                fold_codes = codes[rows]
+                fold_counts = np.bincount(fold_codes, minlength=len(counts))
+                fold_hits = np.bincount(fold_codes, weights=y[rows], minlength=len(counts))
+                out[rows, 2 * j + 1] = self._rate(hits - fold_hits, counts - fold_counts)[fold_codes]
+        return out
+
+    def transform(self, X):
+        return np.hstack([self._lookup(table, _column_values(X, column))
+                          for column, table in zip(self.columns_, self.tables_)])
+
+    def get_feature_names_out(self, input_features=None):
+        return np.array([f"{c}_{stat}" for c in self.columns_ for stat in ("log_count", "rate")],
+                        dtype=object)
@@ -0,0 +1,212 @@
+"""
+Objective 3 - Project 2: Language Mastery Progress Model (online updates)
+
+train.py refits the whole pipeline from the CSV. This module learns from
+every attempt as it happens, so a learner's next probability changes
+right after they answer, with no nightly retrain.
+
+- OnlineMasteryModel keeps a small STATE TABLE per (user, word): attempts,
+  correct answers, the day it was last seen and the current streak. The
+  four numeric features of the CSV (attempts_total, correct_rate,
+  days_since_last_seen, current_streak) are computed from it on demand.
+- record_attempt() turns the state BEFORE an attempt into a feature row,
+  labels it with the outcome (that is exactly what is_correct_next means),
+  takes one SGD step on it (SGDClassifier.partial_fit, logistic loss),
+  then updates the state. It returns the learner's new probability for
+  that word. The feature scaler is fitted by bootstrap() and then frozen.
+- user_id / word are encoded with HashingEncoder, so new learners and new
+  words never change the width of the model.
+
+bootstrap() gives the model a warm start from the training CSV. It makes a
+few partial_fit passes over its rows, and it seeds the state table from
+the last row of each (user, word) pair.
+
+How to run:
+    python online.py --bootstrap ../data/mastery_generated.csv --events attempts.csv
+    (attempts.csv: user_id,word,correct,timestamp)
+"""
+
+import argparse
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from encoders import HashingEncoder
+from train import CAT_COLS, NUM_COLS
+
+SECONDS_PER_DAY = 86400.0
+
+# Epoch numbers are read in the first unit whose range they fall in: a day
+# count stays below 1e6 (year 4707), epoch seconds below 1e11 (year 5138),
+# and so on. Present-day values of each unit are far apart.
+NUMERIC_UNITS = [(1e6, 1.0), (1e11, SECONDS_PER_DAY), (1e14, SECONDS_PER_DAY * 1e3),
+                 (1e17, SECONDS_PER_DAY * 1e6), (np.inf, SECONDS_PER_DAY * 1e9)]
+
+
+def to_day(timestamp):
+    """
+    Days since the epoch (float) for a timestamp, datetime string or number.
+
+    Numbers are epoch days, seconds, milliseconds, microseconds or
+    nanoseconds, told apart by their size (see NUMERIC_UNITS).
+    """
+    if isinstance(timestamp, (int, float, np.integer, np.floating)):
+        value = float(timestamp)
+        for limit, per_day in NUMERIC_UNITS:
+            if abs(value) < limit:
+                return value / per_day
+    return pd.Timestamp(timestamp).timestamp() / SECONDS_PER_DAY
+
+
+class OnlineMasteryModel:
+    """
+    Logistic regression over hashed user/word + state features, updated
+    one attempt at a time.
+    """
+
+    def __init__(self, hash_features=2 ** 20, eta0=0.02, alpha=1e-6, seed=42):
+        self.hasher = HashingEncoder(n_features=hash_features).fit({c: [] for c in CAT_COLS})
+        self.scaler = StandardScaler()
+        self.model = SGDClassifier(loss="log_loss", learning_rate="constant", eta0=eta0,
+                                   alpha=alpha, random_state=seed)
+        # (user_id, word) -> [attempts, correct, last_seen_day, streak]
+        self.state = {}
+        self.updates = 0
+
+    # -----------------------------
+    # Features
+    # -----------------------------
+    def state_features(self, user_id, word, day):
+        """
+        The CSV's numeric features for a (user, word) pair on `day`.
+        """
+        attempts, correct, last_seen, streak = self.state.get((user_id, word), (0, 0, day, 0))
+        return {
+            "attempts_total": attempts,
+            "correct_rate": correct / attempts if attempts else 0.0,
+            "days_since_last_seen": max(day - last_seen, 0.0),
+            "current_streak": streak,
+        }
+
+    def _matrix(self, records):
+        cat = self.hasher.transform({c: records[c] for c in CAT_COLS})
+        num = np.column_stack([np.asarray(records[c], dtype=np.float64) for c in NUM_COLS])
+        return sparse.hstack([cat, sparse.csr_matrix(self.scaler.transform(num))], format="csr")
+
+    def _learn(self, records, y):
+        # The scaler stays as bootstrap() fitted it. Moving it with every
+        # event would shift the inputs under weights learned on the old scale.
+        self.model.partial_fit(self._matrix(records), np.asarray(y), classes=[0, 1])
+        self.updates += len(y)
+
+    # -----------------------------
+    # Scoring
+    # -----------------------------
+    def predict_proba(self, records):
+        """
+        P(correct next time) for a dict of arrays / DataFrame with the CSV
+        columns (like MasteryScorer.predict_proba).
+        """
+        return self.model.predict_proba(self._matrix(records))[:, 1]
+
+    def probability(self, user_id, word, day):
+        """
+        Current P(correct) for one learner and word, from the state table.
+        """
+        row = {"user_id": [user_id], "word": [word]}
+        row.update({k: [v] for k, v in self.state_features(user_id, word, day).items()})
+        return float(self.predict_proba(row)[0])
+
+    # -----------------------------
+    # Updates
+    # -----------------------------
+    def record_attempt(self, user_id, word, correct, day):
+        """
+        Learn from one attempt, update the state and return the new
+        probability of getting `word` right next time.
+        """
+        day = to_day(day)
+        row = {"user_id": [user_id], "word": [word]}
+        row.update({k: [v] for k, v in self.state_features(user_id, word, day).items()})
+        self._learn(row, [int(correct)])
+
+        attempts, hits, _, streak = self.state.get((user_id, word), (0, 0, day, 0))
+        self.state[(user_id, word)] = [attempts + 1, hits + int(correct), day,
+                                       streak + 1 if correct else 0]
+        return self.probability(user_id, word, day)
+
+    def bootstrap(self, frame, epochs=5, batch_rows=256, day=None):
+        """
+        Warm start from rows in the training CSV format and seed the state
+        table from each (user, word) pair's last row, as of `day` (today
+        by default). The feature scaler is fitted here, once, and then
+        frozen, so call this before record_attempt().
+        """
+        day = to_day(pd.Timestamp.now()) if day is None else to_day(day)
+        self.scaler.fit(np.column_stack([frame[c].to_numpy(dtype=np.float64) for c in NUM_COLS]))
+        y = frame["is_correct_next"].to_numpy()
+        rng = np.random.default_rng(self.model.random_state)
+        for _ in range(epochs):
+            order = rng.permutation(len(frame))
+            for start in range(0, len(frame), batch_rows):
+                rows = order[start:start + batch_rows]
+                self._learn({c: frame[c].to_numpy()[rows] for c in CAT_COLS + NUM_COLS}, y[rows])
+
+        last = frame.drop_duplicates(CAT_COLS, keep="last")
+        for r in last.itertuples(index=False):
+            attempts = int(r.attempts_total)
+            self.state[(r.user_id, r.word)] = [attempts, int(round(r.correct_rate * attempts)),
+                                               day - float(r.days_since_last_seen), int(r.current_streak)]
+        return self
+
+    def save(self, path):
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path):
+        return joblib.load(path)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Update the mastery model one attempt at a time.")
+    parser.add_argument("--bootstrap", default="../data/mastery_generated.csv",
+                        help="training CSV used for the warm start (ignored with --model-in)")
+    parser.add_argument("--model-in", default=None, help="continue from a saved online model")
+    parser.add_argument("--events", default=None,
+                        help="CSV of attempts: user_id,word,correct,timestamp (in time order; "
+                             "datetime strings or epoch seconds / milliseconds)")
+    parser.add_argument("--model-out", default="../models/online_model.joblib")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.model_in:
+        online = OnlineMasteryModel.load(args.model_in)
+    else:
+        online = OnlineMasteryModel().bootstrap(pd.read_csv(args.bootstrap))
+        print(f"Bootstrapped from {args.bootstrap} ({online.updates} updates, "
+              f"{len(online.state)} user/word pairs)")
+
+    if args.events:
+        events = pd.read_csv(args.events)
+        start = time.perf_counter()
+        for e in events.itertuples(index=False):
+            p = online.record_attempt(e.user_id, e.word, e.correct, e.timestamp)
+        elapsed = time.perf_counter() - start
+        print(f"Applied {len(events)} attempts in {elapsed:.2f}s "
+              f"({elapsed / max(len(events), 1) * 1000:.2f} ms each)")
+        if len(events):
+            print(f"Last attempt: {e.user_id} / {e.word} -> P(correct next) = {p:.3f}")
+
+    online.save(args.model_out)
+    print("Saved online model to", args.model_out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+"""
+Objective 3 - Project 2: Language Mastery Progress Model (review scheduler)
+
+Turns the model's predictions into a spaced-repetition schedule: for every
+user, which words to review next.
+
+Recall DECAYS with days_since_last_seen. In the logistic model, the logit
+of P(correct) for a word last seen on day s is
+
+    z(t) = z0 + slope * (t - s)            (slope < 0: forgetting)
+
+where z0 is the logit on the day it was seen. Every word of a model shares
+the same slope, so the ORDER of a user's words by current recall never
+changes as time passes. That means each word needs only one fixed key:
+the DUE day, when its recall falls to --threshold:
+
+    due = s + (logit(threshold) - z0) / slope
+
+Lowest due day = most forgotten word. So each user gets a min-heap of due
+days that does not have to be touched as days go by.
+
+- Lazy updates: a review pushes a new (due, word) entry and leaves the old
+  one in the heap. Stale entries are dropped the next time they surface,
+  so every update is O(log n).
+- next_words(user, N) pops N live entries and pushes them back:
+  O(N log n), never a full sort.
+- Compact storage: a heap entry is ONE int64 (due minute << 24 | word id).
+  On disk, all users' heaps are one sorted array plus per-user offsets
+  (a sorted slice is already a valid heap), in a data-* folder that
+  meta.json points to, so a save is published all at once. Loading memory-maps those
+  arrays, and a user's heap only becomes a Python list once that user is
+  read or updated.
+
+How to run:
+    python scheduler.py --data ../data/mastery_generated.csv --user u1 --n 5
+    python scheduler.py --state ../models/review_schedule --user u1 --n 5
+    python scheduler.py --benchmark-users 1000000
+"""
+
+import argparse
+import heapq
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+WORD_BITS = 24
+WORD_MASK = (1 << WORD_BITS) - 1
+MINUTES_PER_DAY = 24 * 60
+
+
+def logit(p):
+    p = np.clip(np.asarray(p, dtype=np.float64), 1e-9, 1 - 1e-9)
+    return np.log(p / (1 - p))
+
+
+def due_days(z0, slope, last_seen, threshold=0.7, max_interval=365.0):
+    """
+    Day on which recall falls to `threshold` (vectorized). For words that
+    are already below it, this day is in the past, and the further in the
+    past it is, the more they have been forgotten. No word waits longer
+    than max_interval days.
+    """
+    z0, slope, last_seen = (np.asarray(a, dtype=np.float64) for a in (z0, slope, last_seen))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wait = np.where(slope < 0, (logit(threshold) - z0) / slope, max_interval)
+    return last_seen + np.minimum(np.nan_to_num(wait, nan=max_interval), max_interval)
+
+
+def recall_curve(model, records):
+    """
+    (z0, slope) per record from any model with predict_proba(records):
+    the logit with days_since_last_seen = 0 and its change per day.
+    """
+    base = {k: np.asarray(v) for k, v in records.items()}
+    base["days_since_last_seen"] = np.zeros(len(base["word"]))
+    z0 = logit(model.predict_proba(base))
+    base["days_since_last_seen"] = np.ones(len(base["word"]))
+    return z0, logit(model.predict_proba(base)) - z0
+
+
+class ReviewScheduler:
+    """
+    Per-user min-heaps of word due days, with lazy updates and compact,
+    memory-mapped storage.
+    """
+
+    def __init__(self, threshold=0.7, max_interval=365.0):
+        self.threshold = threshold
+        self.max_interval = max_interval
+        # Frozen part (from disk or a bulk build): users, words, CSR heaps.
+        self.users = np.array([], dtype=str)
+        self.words = np.array([], dtype=str)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.keys = np.zeros(0, dtype=np.int64)
+        self._reset_indexes()
+
+    def _reset_indexes(self):
+        self._user_index = None
+        self._word_index = None
+        self._new_users = {}    # user -> uid, for users added after the freeze
+        self._new_words = {}    # word -> wid
+        self._new_word_names = []
+        self._heaps = {}        # uid -> heap (list of packed keys)
+        self._current = {}      # uid -> {wid: live due minute}
+
+    # -----------------------------
+    # Ids
+    # -----------------------------
+    def _uid(self, user, create=False):
+        if self._user_index is None:
+            self._user_index = pd.Index(self.users)
+        try:
+            return int(self._user_index.get_loc(user))
+        except KeyError:
+            pass
+        if user not in self._new_users and create:
+            self._new_users[user] = len(self.users) + len(self._new_users)
+        return self._new_users.get(user)
+
+    def _wid(self, word, create=False):
+        if self._word_index is None:
+            self._word_index = pd.Index(self.words)
+        try:
+            return int(self._word_index.get_loc(word))
+        except KeyError:
+            pass
+        if word not in self._new_words and create:
+            wid = len(self.words) + len(self._new_words)
+            if wid > WORD_MASK:
+                raise ValueError(f"more than {WORD_MASK + 1} words")
+            self._new_words[word] = wid
+            self._new_word_names.append(word)
+        return self._new_words.get(word)
+
+    def _word_name(self, wid):
+        if wid < len(self.words):
+            return str(self.words[wid])
+        return self._new_word_names[wid - len(self.words)]
+
+    def _heap(self, uid):
+        heap = self._heaps.get(uid)
+        if heap is None:
+            if uid < len(self.users):
+                heap = self.keys[self.offsets[uid]:self.offsets[uid + 1]].tolist()
+            else:
+                heap = []
+            self._heaps[uid] = heap
+            self._current[uid] = {key & WORD_MASK: key >> WORD_BITS for key in heap}
+        return heap
+
+    # -----------------------------
+    # Building and updating
+    # -----------------------------
+    def build(self, users, words, due):
+        """
+        Bulk-load a schedule (one due day per user/word pair, vectorized).
+        Replaces whatever the scheduler held.
+        """
+        user_codes, self.users = pd.factorize(np.asarray(users))
+        word_codes, self.words = pd.factorize(np.asarray(words))
+        self.users = np.asarray(self.users, dtype=str)
+        self.words = np.asarray(self.words, dtype=str)
+        if len(self.words) > WORD_MASK + 1:
+            raise ValueError(f"more than {WORD_MASK + 1} words")
+
+        minutes = np.round(np.asarray(due, dtype=np.float64) * MINUTES_PER_DAY).astype(np.int64)
+        keys = (minutes << WORD_BITS) | word_codes.astype(np.int64)
+        order = np.lexsort((keys, user_codes))
+        self.keys = keys[order]
+        self.offsets = np.searchsorted(user_codes[order], np.arange(len(self.users) + 1)).astype(np.int64)
+        self._reset_indexes()
+        return self
+
+    def update(self, user, word, due):
+        """
+        Set the due day of one (user, word) pair, e.g. right after a review.
+        """
+        uid = self._uid(user, create=True)
+        heap = self._heap(uid)
+        wid = self._wid(word, create=True)
+        minute = int(round(float(due) * MINUTES_PER_DAY))
+        if self._current[uid].get(wid) != minute:
+            self._current[uid][wid] = minute
+            heapq.heappush(heap, (minute << WORD_BITS) | wid)
+
+    def review(self, user, word, z0, slope, day):
+        """
+        Reschedule a word reviewed on `day`, given its new recall curve
+        (z0, slope), e.g. from recall_curve() or OnlineMasteryModel.
+        """
+        due = due_days(z0, slope, day, self.threshold, self.max_interval)
+        self.update(user, word, float(due))
+        return float(due)
+
+    def remove(self, user, word):
+        uid = self._uid(user)
+        wid = self._wid(word)
+        if uid is None or wid is None:
+            return
+        self._heap(uid)
+        self._current[uid].pop(wid, None)
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def next_words(self, user, n=10, now=None):
+        """
+        The user's n most forgotten words as (word, due_day), soonest due
+        first. With `now`, only words already due by then.
+        """
+        uid = self._uid(user)
+        if uid is None:
+            return []
+        heap = self._heap(uid)
+        current = self._current[uid]
+        limit = None if now is None else int(round(float(now) * MINUTES_PER_DAY))
+
+        found, emitted = [], set()
+        while heap and len(found) < n:
+            key = heap[0]
+            minute, wid = key >> WORD_BITS, key & WORD_MASK
+            if current.get(wid) != minute or wid in emitted:
+                # Stale (reviewed or removed since), or a second copy of a live
+                # key left by moving a word away and back to the same minute.
+                heapq.heappop(heap)
+                continue
+            if limit is not None and minute > limit:
+                break
+            emitted.add(wid)
+            found.append(heapq.heappop(heap))
+        for key in found:
+            heapq.heappush(heap, key)
+        return [(self._word_name(key & WORD_MASK), (key >> WORD_BITS) / MINUTES_PER_DAY) for key in found]
+
+    # -----------------------------
+    # Storage
+    # -----------------------------
+    def _compacted(self, uid):
+        live = sorted((m << WORD_BITS) | w for w, m in self._current[uid].items())
+        return np.array(live, dtype=np.int64)
+
+    def save(self, path):
+        """
+        Write the schedule to a folder of .npy files. Untouched users are
+        copied straight from the frozen arrays; touched ones are compacted.
+
+        The arrays go into a fresh data-* folder, which is then published by
+        replacing meta.json in one os.replace(), so a reader (or a crash)
+        never pairs new keys/offsets with old users/words. The previous
+        data folder is kept for readers that are between reading meta.json
+        and opening the arrays; older ones are removed.
+        """
+        os.makedirs(path, exist_ok=True)
+        n_frozen = len(self.users)
+        new_users = sorted(self._new_users, key=self._new_users.get)
+        new_words = self._new_word_names
+
+        parts, counts, done = [], np.diff(self.offsets).copy(), 0
+        counts = np.concatenate((counts, np.zeros(len(new_users), dtype=np.int64)))
+        for uid in sorted(self._heaps):
+            stop = min(uid, n_frozen)
+            if done < stop:
+                parts.append(self.keys[self.offsets[done]:self.offsets[stop]])
+            live = self._compacted(uid)
+            parts.append(live)
+            counts[uid] = len(live)
+            done = max(done, uid + 1)
+        if done < n_frozen:
+            parts.append(self.keys[self.offsets[done]:self.offsets[n_frozen]])
+
+        arrays = {
+            "users": np.concatenate((self.users, np.asarray(new_users, dtype=str))),
+            "words": np.concatenate((self.words, np.asarray(new_words, dtype=str))),
+            "offsets": np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+            "keys": np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64),
+        }
+        data_dir = tempfile.mkdtemp(prefix="data-", dir=path)
+        os.chmod(data_dir, 0o755)  # mkdtemp makes it private to this user
+        data_name = os.path.basename(data_dir)
+        for name, array in arrays.items():
+            np.save(os.path.join(data_dir, f"{name}.npy"), array)
+
+        meta_path = os.path.join(path, "meta.json")
+        previous = None
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                previous = json.load(f).get("data")
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"threshold": self.threshold, "max_interval": self.max_interval,
+                       "users": len(arrays["users"]), "entries": len(arrays["keys"]),
+                       "data": data_name}, f, indent=2)
+        os.replace(meta_path + ".tmp", meta_path)
+
+        for name in os.listdir(path):
+            if name.startswith("data-") and name not in (data_name, previous):
+                shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+    @classmethod
+    def load(cls, path):
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        data_dir = os.path.join(path, meta["data"])
+        scheduler = cls(meta["threshold"], meta["max_interval"])
+        scheduler.users = np.load(os.path.join(data_dir, "users.npy"), mmap_mode="r")
+        scheduler.words = np.load(os.path.join(data_dir, "words.npy"))
+        scheduler.offsets = np.load(os.path.join(data_dir, "offsets.npy"), mmap_mode="r")
+        scheduler.keys = np.load(os.path.join(data_dir, "keys.npy"), mmap_mode="r")
+        scheduler._reset_indexes()
+        return scheduler
+
+
+def schedule_from_data(model, frame, now, threshold=0.7, max_interval=365.0):
+    """
+    Build a scheduler from rows in the training CSV format (the last row of
+    each user/word pair is its current state, as of day `now`).
+    """
+    last = frame.drop_duplicates(["user_id", "word"], keep="last")
+    records = {c: last[c].to_numpy() for c in last.columns if c != "is_correct_next"}
+    z0, slope = recall_curve(model, records)
+    seen = now - records["days_since_last_seen"].astype(np.float64)
+    due = due_days(z0, slope, seen, threshold, max_interval)
+    return ReviewScheduler(threshold, max_interval).build(records["user_id"], records["word"], due)
+
+
+def benchmark(n_users, words_per_user=20, n_words=50_000, path="../models/review_schedule_bench"):
+    rng = np.random.default_rng(0)
+    n = n_users * words_per_user
+    user_names = np.array([f"u{i}" for i in range(n_users)])
+    word_names = np.array([f"w{i}" for i in range(n_words)])
+    users = np.repeat(user_names, words_per_user)
+    words = word_names[rng.integers(0, n_words, n)]
+    due = 20_000 + rng.uniform(0, 60, n)
+
+    start = time.perf_counter()
+    scheduler = ReviewScheduler().build(users, words, due)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    scheduler.save(path)
+    saved = time.perf_counter() - start
+    size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)) / 1e6
+
+    start = time.perf_counter()
+    scheduler = ReviewScheduler.load(path)
+    loaded = time.perf_counter() - start
+
+    sample = user_names[rng.integers(0, n_users, 2000)]
+    start = time.perf_counter()
+    scheduler.next_words(sample[0], 5)  # first lookup builds the user index
+    indexed = time.perf_counter() - start
+    start = time.perf_counter()
+    for user in sample:
+        scheduler.next_words(user, 5)
+    first_query = (time.perf_counter() - start) / len(sample)
+    start = time.perf_counter()
+    for user in sample:
+        scheduler.update(user, word_names[rng.integers(0, n_words)], 20_030.0)
+        scheduler.next_words(user, 5)
+    warm = (time.perf_counter() - start) / len(sample)
+
+    print(f"{n_users:,} users x {words_per_user} words ({n:,} entries)")
+    print(f"  build {built:.2f}s  save {saved:.2f}s ({size:.0f} MB)  load {loaded * 1000:.1f} ms  "
+          f"user index {indexed:.2f}s")
+    print(f"  next 5 words: {first_query * 1e6:.0f} us (first touch), "
+          f"update + next 5: {warm * 1e6:.0f} us")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Spaced-repetition review schedule from the mastery model.")
+    parser.add_argument("--data", default="../data/mastery_generated.csv",
+                        help="CSV in the training format to build the schedule from")
+    parser.add_argument("--pipeline", default="../models/language_mastery_pipeline.joblib")
+    parser.add_argument("--state", default="../models/review_schedule",
+                        help="schedule folder; with --user and an existing folder, only query it")
+    parser.add_argument("--user", default=None)
+    parser.add_argument("--n", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.7,
+                        help="review a word when its predicted recall falls to this (default: 0.7)")
+    parser.add_argument("--benchmark-users", type=int, default=None)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.benchmark_users:
+        benchmark(args.benchmark_users)
+        return
+
+    today = pd.Timestamp.now().timestamp() / 86400.0
+    if args.user and os.path.exists(os.path.join(args.state, "meta.json")):
+        scheduler = ReviewScheduler.load(args.state)
+    else:
+        from score import load_scorer
+        scheduler = schedule_from_data(load_scorer(args.pipeline), pd.read_csv(args.data), today,
+                                       threshold=args.threshold)
+        scheduler.save(args.state)
+        print(f"Scheduled {len(scheduler.keys):,} words for {len(scheduler.users):,} users -> {args.state}")
+
+    user = args.user or str(scheduler.users[0])
+    print(f"Next {args.n} words for {user}:")
+    for word, due in scheduler.next_words(user, args.n):
+        when = "due now" if due <= today else f"due in {due - today:.1f} days"
+        print(f"  {word:<12} {when}")
+
+
+if __name__ == "__main__":
+    main()
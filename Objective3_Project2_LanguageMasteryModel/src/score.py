@@ -0,0 +1,226 @@
+"""
+Objective 3 - Project 2: Language Mastery Progress Model (batch scoring)
+
+Scores (user_id, word, ...) records in bulk with the saved pipeline.
+
+1. BULK mode streams records from files in chunks (CSV, JSONL or Parquet,
+   or a folder of them) and writes one probability per record to CSV or
+   Parquet, so millions of learners never have to fit in memory at once.
+
+2. MasteryScorer is the in-process API. It accepts a dict of arrays (or
+   any column mapping, such as a DataFrame) and does NOT build a DataFrame
+   or a sparse one-hot matrix for each call. The fitted pipeline is
+   "compiled" into plain arrays instead:
+   - each categorical column's sorted categories and their logistic
+     regression weights (one-hot x weights == look up one weight)
+   - the scaler's mean / scale folded together with the numeric weights
+   Categories are looked up with a vectorized binary search
+   (np.searchsorted), and unknown ones add nothing, just like
+   OneHotEncoder(handle_unknown="ignore").
+
+Pipelines with another layout fall back to pipe.predict_proba().
+
+How to run:
+    python score.py --input ../data/mastery_generated.csv --out ../models/scores.csv
+    python score.py --input nightly/ --out scores.parquet --chunk-rows 500000
+"""
+
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+PIPELINE_PATH = "../models/language_mastery_pipeline.joblib"
+ID_COLS = ["user_id", "word"]
+
+
+class MasteryScorer:
+    """
+    Fast probability-of-correct scoring for a fitted LanguageMastery pipeline.
+    """
+
+    def __init__(self, pipe):
+        self.pipe = pipe
+        self.compiled = False
+        try:
+            self._compile(pipe)
+            self.compiled = True
+        except (AttributeError, KeyError, TypeError, ValueError):
+            # Unknown pipeline layout: score through scikit-learn instead.
+            pass
+
+    def _compile(self, pipe):
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+        pre = pipe.named_steps["pre"]
+        model = pipe.named_steps["model"]
+        if not isinstance(model, LogisticRegression) or model.coef_.shape[0] != 1:
+            raise TypeError("expected a binary LogisticRegression")
+
+        weights = model.coef_[0]
+        self.intercept = float(model.intercept_[0])
+        self.categorical = []  # (column, sorted categories, weights)
+        self.numeric_cols = []
+        numeric_weights, numeric_shift = [], 0.0
+
+        offset = 0
+        for name, transformer, columns in pre.transformers_:
+            if transformer == "drop" or name == "remainder":
+                continue
+            if isinstance(transformer, OneHotEncoder):
+                if transformer.drop is not None:
+                    raise ValueError("dropped one-hot columns are not supported")
+                for column, categories in zip(columns, transformer.categories_):
+                    cats = np.asarray(categories).astype(str)
+                    if (cats[1:] < cats[:-1]).any():
+                        raise ValueError("categories are not sorted as strings")
+                    self.categorical.append((column, cats, weights[offset:offset + len(cats)]))
+                    offset += len(cats)
+            elif isinstance(transformer, StandardScaler):
+                w = weights[offset:offset + len(columns)]
+                mean = transformer.mean_ if transformer.with_mean else np.zeros(len(columns))
+                scale = transformer.scale_ if transformer.with_std else np.ones(len(columns))
+                # ((x - mean) / scale) @ w == x @ (w / scale) - mean @ (w / scale)
+                numeric_weights.append(w / scale)
+                numeric_shift += float(mean @ (w / scale))
+                self.numeric_cols += list(columns)
+                offset += len(columns)
+            else:
+                raise TypeError(f"unsupported transformer {transformer!r}")
+
+        if offset != len(weights):
+            raise ValueError("pipeline output does not match the model's coefficients")
+        self.numeric_weights = np.concatenate(numeric_weights) if numeric_weights else np.zeros(0)
+        self.intercept -= numeric_shift
+
+    def decision_function(self, records):
+        """
+        Logit of P(correct next) for each record.
+        """
+        n = len(records[self.numeric_cols[0] if self.numeric_cols else self.categorical[0][0]])
+        z = np.full(n, self.intercept, dtype=np.float64)
+
+        for column, cats, weights in self.categorical:
+            values = np.asarray(records[column]).astype(str)
+            pos = np.searchsorted(cats, values)
+            pos[pos == len(cats)] = 0
+            found = cats[pos] == values
+            z[found] += weights[pos[found]]
+
+        for column, weight in zip(self.numeric_cols, self.numeric_weights):
+            z += weight * np.asarray(records[column], dtype=np.float64)
+        return z
+
+    def predict_proba(self, records):
+        """
+        P(correct next time) for each record, as a 1-D array.
+
+        `records` maps column name -> array (dict of NumPy arrays, lists,
+        a DataFrame, ...).
+        """
+        if not self.compiled:
+            frame = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+            return self.pipe.predict_proba(frame)[:, 1]
+        return 1.0 / (1.0 + np.exp(-self.decision_function(records)))
+
+
+def load_scorer(path=PIPELINE_PATH):
+    return MasteryScorer(joblib.load(path))
+
+
+def iter_record_chunks(path, chunk_rows=200_000):
+    """
+    Yield DataFrame chunks from a CSV / JSONL / Parquet file, or from every
+    such file in a folder (in name order).
+    """
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            yield from iter_record_chunks(os.path.join(path, name), chunk_rows)
+        return
+
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    elif path.endswith(".jsonl"):
+        yield from pd.read_json(path, lines=True, chunksize=chunk_rows)
+    elif path.endswith(".csv"):
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+
+
+class ScoreWriter:
+    """
+    Append scored chunks to one CSV or Parquet file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        self._writer = None
+        self._first = True
+
+    def write(self, frame):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def score_files(scorer, in_path, out_path, chunk_rows=200_000):
+    """
+    Stream records through the scorer and write
+    user_id, word, p_correct_next for each of them. Returns the row count.
+    """
+    writer = ScoreWriter(out_path)
+    rows = 0
+    try:
+        for chunk in iter_record_chunks(in_path, chunk_rows):
+            probs = scorer.predict_proba(chunk)
+            out = chunk[[c for c in ID_COLS if c in chunk.columns]].copy()
+            out["p_correct_next"] = probs.astype(np.float32)
+            writer.write(out)
+            rows += len(chunk)
+    finally:
+        writer.close()
+    return rows
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Score (user, word) records in bulk.")
+    parser.add_argument("--input", default="../data/mastery_generated.csv",
+                        help="CSV / JSONL / Parquet file, or a folder of them")
+    parser.add_argument("--out", default="../models/scores.csv", help="output .csv or .parquet")
+    parser.add_argument("--pipeline", default=PIPELINE_PATH)
+    parser.add_argument("--chunk-rows", type=int, default=200_000)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    scorer = load_scorer(args.pipeline)
+
+    start = time.perf_counter()
+    rows = score_files(scorer, args.input, args.out, chunk_rows=args.chunk_rows)
+    elapsed = time.perf_counter() - start
+
+    mode = "compiled arrays" if scorer.compiled else "scikit-learn pipeline"
+    print(f"Scored {rows:,} records in {elapsed:.2f}s ({mode})")
+    print("Saved scores to", args.out)
+
+
+if __name__ == "__main__":
+    main()
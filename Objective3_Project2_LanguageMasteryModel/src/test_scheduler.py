@@ -0,0 +1,42 @@
+"""
+Regression tests for ReviewScheduler (run: python -m pytest test_scheduler.py).
+"""
+
+from scheduler import ReviewScheduler
+
+
+def test_moving_a_word_back_to_its_old_due_day_lists_it_once():
+    scheduler = ReviewScheduler()
+    scheduler.update("u1", "apple", 100)
+    scheduler.update("u1", "river", 105)
+    scheduler.update("u1", "apple", 110)
+    scheduler.update("u1", "apple", 100)
+
+    assert scheduler.next_words("u1") == [("apple", 100.0), ("river", 105.0)]
+    # The query puts its keys back; asking again gives the same answer.
+    assert scheduler.next_words("u1") == [("apple", 100.0), ("river", 105.0)]
+
+
+def test_round_trip_on_a_single_word():
+    scheduler = ReviewScheduler()
+    for due in (5, 6, 5):
+        scheduler.update("u1", "a", due)
+
+    assert scheduler.next_words("u1") == [("a", 5.0)]
+
+
+def test_save_publishes_a_consistent_schedule(tmp_path):
+    scheduler = ReviewScheduler().build(["u1", "u1", "u2"], ["a", "b", "a"], [1.0, 2.0, 3.0])
+    scheduler.save(tmp_path)
+    first = ReviewScheduler.load(tmp_path)
+
+    scheduler.update("u3", "c", 0.5)
+    scheduler.save(tmp_path)
+    scheduler.save(tmp_path)
+    loaded = ReviewScheduler.load(tmp_path)
+
+    assert loaded.next_words("u3") == [("c", 0.5)]
+    assert loaded.next_words("u1") == [("a", 1.0), ("b", 2.0)]
+    # A schedule loaded before the saves still reads its own arrays.
+    assert first.next_words("u2") == [("a", 3.0)]
+    assert len([p for p in tmp_path.iterdir() if p.name.startswith("data-")]) == 2
@@ -1,3 +1,4 @@
+import argparse
 import json
 import joblib
 import pandas as pd
@@ -8,33 +9,59 @@ from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
-def main():
-    try:
-        df = pd.read_csv("../data/mastery_generated.csv")
-    except FileNotFoundError:
-        df = pd.read_csv("../data/mastery_sample.csv")
+from encoders import FrequencyEncoder, HashingEncoder
 
-    target = "is_correct_next"
-    X = df.drop(columns=[target])
-    y = df[target]
+CAT_COLS = ["user_id", "word"]
+NUM_COLS = ["attempts_total", "correct_rate", "days_since_last_seen", "current_streak"]
 
-    cat_cols = ["user_id", "word"]
-    num_cols = ["attempts_total", "correct_rate", "days_since_last_seen", "current_streak"]
+def make_encoder(name, hash_features=2 ** 20):
+    # onehot: one column per user / word (the original pipeline)
+    # hash:   a fixed number of hashed columns, no vocabulary to store
+    # freq:   log count + smoothed correct rate per user / word (lookup table)
+    if name == "onehot":
+        return OneHotEncoder(handle_unknown="ignore")
+    if name == "hash":
+        return HashingEncoder(n_features=hash_features)
+    if name == "freq":
+        return FrequencyEncoder()
+    raise ValueError(f"unknown encoder {name!r}")
 
+def build_pipeline(encoder="onehot", hash_features=2 ** 20):
     pre = ColumnTransformer(
         transformers=[
-            ("cat", OneHotEncoder(handle_unknown="ignore"), cat_cols),
-            ("num", StandardScaler(), num_cols),
+            ("cat", make_encoder(encoder, hash_features), CAT_COLS),
+            ("num", StandardScaler(), NUM_COLS),
         ]
     )
 
     model = LogisticRegression(max_iter=2000)
 
-    pipe = Pipeline([
+    return Pipeline([
         ("pre", pre),
         ("model", model)
     ])
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the language mastery pipeline.")
+    parser.add_argument("--encoder", choices=["onehot", "hash", "freq"], default="onehot",
+                        help="how user_id / word are encoded (default: onehot)")
+    parser.add_argument("--hash-features", type=int, default=2 ** 20,
+                        help="number of hashed columns for --encoder hash")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    try:
+        df = pd.read_csv("../data/mastery_generated.csv")
+    except FileNotFoundError:
+        df = pd.read_csv("../data/mastery_sample.csv")
+
+    target = "is_correct_next"
+    X = df.drop(columns=[target])
+    y = df[target]
+
+    pipe = build_pipeline(args.encoder, args.hash_features)
+
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.25, random_state=42, stratify=y
     )
@@ -51,7 +78,8 @@ def main():
         "roc_auc": float(roc_auc_score(y_test, probs)),
         "train_rows": int(len(X_train)),
         "test_rows": int(len(X_test)),
-        "features": {"categorical": cat_cols, "numeric": num_cols}
+        "features": {"categorical": CAT_COLS, "numeric": NUM_COLS},
+        "encoder": args.encoder
     }
 
     joblib.dump(pipe, "../models/language_mastery_pipeline.joblib")